@@ -0,0 +1,170 @@
+# by Giu
+# https://github.com/o-giu
+
+from typing import Callable, Optional
+
+import numpy as np
+
+import giu_flappybird_sim as sim
+from giu_flappybird_sim import GameConfig
+
+def _rect_coords(values: np.ndarray) -> np.ndarray:
+    # Vectorized sim.rect_coord: round half away from zero like pygame.Rect
+    return np.where(values >= 0, np.floor(values + 0.5), -np.floor(0.5 - values))
+
+class BatchSimulation:
+    """Advances ``num_games`` independent games per call with NumPy arrays.
+
+    Mirrors ``Simulation.step`` rule for rule: the same ``Bird.update``
+    physics, difficulty ramp, pipe spawning, ``Pipe.passed`` scoring and
+    rect collisions, but every bird and pipe field is a column in an array.
+    Pipes are kept in a small per-game ring of ``max_pipes`` slots. With
+    ``shared_pipes`` every game sees the same gap sequence, which is what a
+    population evaluation usually wants.
+    """
+
+    def __init__(self, num_games: int, config: Optional[GameConfig] = None,
+                 seed: Optional[int] = None, shared_pipes: bool = False,
+                 max_pipes: int = 4):
+        self.config = config or GameConfig()
+        if self.config.VALIDATE_GAPS:
+            raise ValueError("BatchSimulation does not support VALIDATE_GAPS")
+        self.num_games = num_games
+        self.shared_pipes = shared_pipes
+        self.max_pipes = max_pipes
+        self.rng = np.random.default_rng(seed)
+
+        # Physics constants come from the scalar classes they mirror
+        bird = sim.Bird(self.config)
+        self.bird_x = bird.x
+        self.start_y = bird.y
+        self.gravity = bird.gravity
+        self.flap_strength = bird.flap_strength
+        self.base_speed = sim.Pipe(self.config, 0, 0).base_speed
+
+        n, k = num_games, max_pipes
+        self.y = np.empty(n)
+        self.velocity = np.empty(n)
+        self.alive = np.empty(n, dtype=bool)
+        self.score = np.empty(n, dtype=np.int64)
+        self.frames = np.empty(n, dtype=np.int64)
+        self.pipe_x = np.empty((n, k))
+        self.pipe_speed = np.empty((n, k))
+        self.pipe_gap_y = np.empty((n, k), dtype=np.int64)
+        self.pipe_top = np.empty((n, k), dtype=np.int64)
+        self.pipe_bottom = np.empty((n, k), dtype=np.int64)
+        self.pipe_active = np.empty((n, k), dtype=bool)
+        self.pipe_passed = np.empty((n, k), dtype=bool)
+        self.newest = np.empty(n, dtype=np.int64)
+        self._rows = np.arange(n)
+        self.reset()
+
+    def reset(self):
+        self.frame = 0
+        self.difficulty_factor = 1.0
+        self.gap_size = self.config.GAP_SIZE
+        self.y.fill(self.start_y)
+        self.velocity.fill(0)
+        self.alive.fill(True)
+        self.score.fill(0)
+        self.frames.fill(0)
+        self.pipe_active.fill(False)
+        self.pipe_passed.fill(False)
+        self.pipe_x.fill(0)
+        self.pipe_speed.fill(0)
+        self.newest.fill(self.max_pipes - 1)
+        self._spawn(np.ones(self.num_games, dtype=bool))
+
+    def _spawn(self, mask: np.ndarray):
+        rows = self._rows[mask]
+        if rows.size == 0:
+            return
+        slots = (self.newest[rows] + 1) % self.max_pipes
+        high = self.config.WINDOW_SIZE[1] - 200
+        gap_y = self.rng.integers(200, high, size=1 if self.shared_pipes else rows.size,
+                                  endpoint=True)
+        half_gap = self.gap_size // 2
+        self.pipe_x[rows, slots] = self.config.WINDOW_SIZE[0]
+        self.pipe_speed[rows, slots] = self.base_speed
+        self.pipe_gap_y[rows, slots] = gap_y
+        self.pipe_top[rows, slots] = (gap_y - half_gap).astype(np.int64)
+        self.pipe_bottom[rows, slots] = (gap_y + half_gap).astype(np.int64)
+        self.pipe_active[rows, slots] = True
+        self.pipe_passed[rows, slots] = False
+        self.newest[rows] = slots
+
+    def step(self, flap: Optional[np.ndarray] = None) -> np.ndarray:
+        """Advance every live game one frame. Returns the alive mask."""
+        live = self.alive.copy()
+        if flap is not None:
+            self.velocity[live & flap] = self.flap_strength
+
+        self.frame += 1
+        self.frames += live
+        self.velocity += self.gravity * live
+        self.y += self.velocity * live
+
+        # Update difficulty based on time
+        self.difficulty_factor = min(3.0, 1.0 + self.frame / self.config.FPS / 30)
+        self.pipe_speed.fill(self.base_speed * self.difficulty_factor)
+        self.gap_size = max(120, 200 - (self.difficulty_factor - 1) * 100)
+
+        # Spawn new pipes
+        newest_x = self.pipe_x[self._rows, self.newest]
+        self._spawn(live & (newest_x < self.config.WINDOW_SIZE[0] - 500))
+
+        # Update pipes
+        moving = self.pipe_active & live[:, None]
+        self.pipe_x -= self.pipe_speed * moving
+        pipe_right = self.pipe_x + self.config.PIPE_WIDTH
+
+        # Score when passing pipes
+        passing = moving & ~self.pipe_passed & (pipe_right < self.bird_x)
+        self.pipe_passed |= passing
+        self.score += passing.sum(axis=1)
+
+        # Remove off-screen pipes
+        self.pipe_active &= ~(moving & (pipe_right <= 0))
+
+        # Check collisions
+        height = self.config.WINDOW_SIZE[1]
+        bird_w, bird_h = self.config.BIRD_SIZE
+        crashed = (self.y < 0) | (self.y + bird_h > height)
+
+        bird_top = _rect_coords(self.y)[:, None]
+        bird_bottom = bird_top + bird_h
+        pipe_left = _rect_coords(self.pipe_x)
+        overlap_x = ((pipe_left < self.bird_x + bird_w) &
+                     (pipe_left + self.config.PIPE_WIDTH > self.bird_x))
+        hit_top = (self.pipe_top > 0) & (bird_top < self.pipe_top) & (bird_bottom > 0)
+        hit_bottom = ((self.pipe_bottom < height) & (bird_top < height) &
+                      (bird_bottom > self.pipe_bottom))
+        crashed |= (self.pipe_active & overlap_x & (hit_top | hit_bottom)).any(axis=1)
+
+        self.alive &= ~(live & crashed)
+        return self.alive
+
+    def observe(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Per-game features: bird y, velocity, next pipe x and its gap_y."""
+        if out is None:
+            out = np.empty((self.num_games, 4), dtype=np.float32)
+        upcoming = self.pipe_active & ~self.pipe_passed
+        next_pipe = np.where(upcoming, self.pipe_x, np.inf).argmin(axis=1)
+        out[:, 0] = self.y
+        out[:, 1] = self.velocity
+        out[:, 2] = self.pipe_x[self._rows, next_pipe]
+        out[:, 3] = self.pipe_gap_y[self._rows, next_pipe]
+        return out
+
+    def evaluate(self, policy: Callable[[np.ndarray], np.ndarray],
+                 max_frames: int = 60 * 60 * 5) -> np.ndarray:
+        """Reset and play every game until all die or ``max_frames`` pass.
+
+        ``policy`` maps the ``observe`` matrix to a boolean flap mask.
+        Returns the per-game scores.
+        """
+        self.reset()
+        obs = np.empty((self.num_games, 4), dtype=np.float32)
+        while self.frame < max_frames and self.alive.any():
+            self.step(policy(self.observe(obs)))
+        return self.score.copy()
@@ -0,0 +1,198 @@
+# by Giu
+# https://github.com/o-giu
+
+import os
+
+# Headless: must be set before pygame creates the display
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict, List
+
+import pygame
+
+import giu_flappybird_sim as sim
+from giu_flappybird_game import Bird, FlappyBird, Pipe
+from giu_flappybird_sim import Simulation
+
+SEED = 1234
+DIFFICULTY_LEVELS = (1.0, 2.0, 3.0)
+
+def measure(func: Callable[[], None], number: int, repeat: int) -> float:
+    """Best of ``repeat`` runs of ``number`` calls, in microseconds per call."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, perf_counter() - start)
+    return best / number * 1e6
+
+def place_pipes(game_sim: Simulation, count: int):
+    """Resets the game with ``count`` pipes spread evenly across the screen.
+
+    The newest pipe sits at the right edge so no extra pipe spawns.
+    """
+    game_sim.reset(SEED)
+    config = game_sim.config
+    game_sim.pipes.clear()
+    spacing = (config.WINDOW_SIZE[0] + config.PIPE_WIDTH) / count
+    for i in range(count):
+        gap_y = game_sim.rng.randint(200, config.WINDOW_SIZE[1] - 200)
+        x = config.WINDOW_SIZE[0] - (count - 1 - i) * spacing
+        game_sim.pipes.spawn(x, gap_y, game_sim.gap_size)
+
+def autopilot(game_sim: Simulation) -> bool:
+    # Flap when below the next gap, keeps most benchmark games alive
+    for pipe in game_sim.pipes:
+        if not pipe.passed:
+            return game_sim.bird.y > pipe.gap_y
+    return False
+
+def set_difficulty(game_sim: Simulation, difficulty: float):
+    game_sim.reset(SEED)
+    game_sim.frame = int((difficulty - 1.0) * 30 * game_sim.config.FPS)
+
+def run_benchmarks(max_pipes: int, scale: float) -> Dict[str, float]:
+    number = max(1, int(2000 * scale))
+    repeat = 5
+    results = {}
+    random.seed(SEED)
+
+    game = FlappyBird()
+    game.reset_game(SEED)
+    config = game.config
+
+    # Simulation
+    bird = sim.Bird(config)
+    def bird_update():
+        bird.update()
+        if bird.y > config.WINDOW_SIZE[1]:
+            bird.reset()
+    results['bird.update'] = measure(bird_update, number * 10, repeat)
+
+    for count in range(1, max_pipes + 1):
+        place_pipes(game.sim, count)
+        bird_state = game.sim.bird.y, game.sim.bird.velocity
+        pipe_xs = [pipe.x for pipe in game.sim.pipes]
+        def frozen_update():
+            # Put the bird and pipes back each call so every update does the same work
+            game.sim.frame = 0
+            game.sim.game_over = False
+            game.sim.bird.y, game.sim.bird.velocity = bird_state
+            for pipe, x in zip(game.sim.pipes, pipe_xs):
+                pipe.x = x
+                pipe.passed = False
+            game.update()
+        results[f'flappybird.update[{count} pipes]'] = measure(frozen_update, number, repeat)
+
+    # Rendering
+    game_bird = Bird(config)
+    results['bird.draw'] = measure(lambda: game_bird.draw(game.screen), number, repeat)
+    pipe = Pipe(config, config.WINDOW_SIZE[0] // 2, config.WINDOW_SIZE[1] // 2)
+    results['pipe.draw'] = measure(lambda: pipe.draw(game.screen), number, repeat)
+    for count in range(1, max_pipes + 1):
+        place_pipes(game.sim, count)
+        results[f'flappybird.draw[{count} pipes]'] = measure(game.draw, number, repeat)
+
+    # Full frames (input, update, draw) at each difficulty level
+    frames = max(1, int(3000 * scale))
+    for difficulty in DIFFICULTY_LEVELS:
+        set_difficulty(game.sim, difficulty)
+        start = perf_counter()
+        for _ in range(frames):
+            if game.sim.game_over:
+                set_difficulty(game.sim, difficulty)
+            pygame.event.pump()
+            game.sim.step(autopilot(game.sim))
+            game.draw()
+        results[f'frame[difficulty {difficulty:g}]'] = (perf_counter() - start) / frames * 1e6
+
+    # Headless simulation throughput
+    game_sim = Simulation(config)
+    start = perf_counter()
+    steps = 0
+    game_sim.reset(SEED)
+    while steps < frames * 20:
+        if not game_sim.step(autopilot(game_sim)):
+            game_sim.reset(SEED + steps)
+        steps += 1
+    results['simulation.step[headless]'] = (perf_counter() - start) / steps * 1e6
+
+    pygame.quit()
+    return results
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """Names of benchmarks more than ``threshold`` slower than the baseline."""
+    regressions = []
+    for name, value in results.items():
+        previous = baseline.get(name)
+        if previous and value > previous * (1 + threshold):
+            regressions.append(name)
+    return regressions
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Giu - Flappy Bird hot paths")
+    parser.add_argument('--output', type=Path, default=Path('bench_results.json'),
+                        help="where to write the results (default: %(default)s)")
+    parser.add_argument('--compare', type=Path, metavar='BASELINE',
+                        help="previous results file to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="allowed slowdown against the baseline (default: %(default)s)")
+    parser.add_argument('--max-pipes', type=int, default=6,
+                        help="benchmark update/draw with 1 to N pipes (default: %(default)s)")
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="multiply the iteration counts, lower is quicker but noisier")
+    args = parser.parse_args(argv)
+
+    output = args.output.resolve()
+    baseline = json.loads(args.compare.read_text())['results'] if args.compare else None
+
+    # Keep FlappyBird's save files away from the player's real ones
+    with tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            results = run_benchmarks(args.max_pipes, args.scale)
+        finally:
+            os.chdir(cwd)
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'video_driver': os.environ['SDL_VIDEODRIVER'],
+            'unit': 'microseconds per call',
+        },
+        'results': results,
+    }
+    output.write_text(json.dumps(report, indent=2))
+
+    for name, value in results.items():
+        line = f"{name:<32} {value:10.2f} us"
+        if baseline and baseline.get(name):
+            line += f"  ({(value / baseline[name] - 1) * 100:+.1f}%)"
+        print(line)
+    print(f"Results written to {output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"Regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+# by Giu
+# https://github.com/o-giu
+
+import argparse
+import mmap
+import os
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import BinaryIO, List, Optional
+
+from giu_flappybird_replay import Replay, load_replays
+from giu_flappybird_sim import GameConfig
+
+# ffmpeg pixel format names for 32 bit surfaces, by (red, green, blue) shift
+PIXEL_FORMATS = {(16, 8, 0): 'bgr0', (0, 8, 16): 'rgb0'}
+
+class FrameRecorder:
+    """Streams surface frames to a raw or Y4M video on a writer thread.
+
+    ``add`` copies the surface's pixels once, straight from its buffer
+    (``Surface.get_buffer``) into a free slot of an anonymous ``mmap`` ring,
+    and hands the slot index to the writer thread. The thread writes the
+    slot out from a ``memoryview`` and frees it, so the render thread never
+    waits on the disk or the encoder. With ``drop=True`` (live play) a full
+    ring drops the frame instead of stalling the game, with ``drop=False``
+    (offline rendering) ``add`` waits for a slot.
+
+    Raw output is the surface's own 32 bit layout, ``pixel_format`` names it
+    for ffmpeg. A path ending in ``.y4m`` is converted to YUV 4:4:4 on the
+    writer thread (needs NumPy), which players and encoders open directly.
+    ``'-'`` writes to stdout, to pipe into an encoder.
+    """
+
+    def __init__(self, path, size, fps: int, slots: int = 8, drop: bool = True,
+                 pixel_format: str = 'bgr0'):
+        self.width, self.height = size
+        self.fps = fps
+        self.drop = drop
+        self.pixel_format = pixel_format
+        self.frame_size = self.width * self.height * 4
+        self.frames = 0
+        self.dropped = 0
+
+        self.y4m = str(path).lower().endswith('.y4m')
+        if self.y4m:
+            import numpy  # noqa: F401, fail now rather than on the writer thread
+        self.output: BinaryIO = sys.stdout.buffer if str(path) == '-' else open(path, 'wb')
+        if self.y4m:
+            self.output.write(f"YUV4MPEG2 W{self.width} H{self.height} F{fps}:1 "
+                              f"Ip A1:1 C444\n".encode())
+
+        self.ring = mmap.mmap(-1, slots * self.frame_size)
+        self.slot_views = [memoryview(self.ring)[i * self.frame_size:(i + 1) * self.frame_size]
+                           for i in range(slots)]
+        self.free_slots = queue.Queue()
+        for i in range(slots):
+            self.free_slots.put(i)
+        self.filled_slots = queue.Queue()
+        self.error = None
+        self._yuv = None  # Conversion matrix and plane buffer, built on the first Y4M frame
+        self.thread = threading.Thread(target=self._run, name='frame-recorder', daemon=True)
+        self.thread.start()
+
+    @classmethod
+    def for_surface(cls, path, surface, fps: int, **kwargs) -> 'FrameRecorder':
+        if surface.get_bytesize() != 4:
+            raise ValueError("frame capture needs a 32 bit surface")
+        shifts = tuple(surface.get_shifts()[:3])
+        return cls(path, surface.get_size(), fps,
+                   pixel_format=PIXEL_FORMATS.get(shifts, 'bgr0'), **kwargs)
+
+    def add(self, surface) -> bool:
+        """Queues the surface's current pixels, False if the frame was dropped."""
+        if self.error:
+            raise RuntimeError(f"frame recorder failed: {self.error}")
+        try:
+            slot = self.free_slots.get(block=not self.drop)
+        except queue.Empty:
+            self.dropped += 1
+            return False
+        target = self.slot_views[slot]
+        pixels = memoryview(surface.get_buffer()).cast('B')
+        row = self.width * 4
+        pitch = surface.get_pitch()
+        if pitch == row:
+            target[:] = pixels
+        else:
+            for y in range(self.height):
+                target[y * row:(y + 1) * row] = pixels[y * pitch:y * pitch + row]
+        pixels.release()  # Unlocks the surface for the next draw
+        self.filled_slots.put(slot)
+        self.frames += 1
+        return True
+
+    def _run(self):
+        write = self._write_y4m if self.y4m else self.output.write
+        while True:
+            slot = self.filled_slots.get()
+            if slot is None:
+                return
+            try:
+                if not self.error:
+                    write(self.slot_views[slot])
+            except Exception as e:
+                self.error = e
+            self.free_slots.put(slot)
+
+    def _write_y4m(self, frame: memoryview):
+        import numpy as np
+        if self._yuv is None:
+            # BT.601 studio range, one row per output plane and one column
+            # per byte of the pixel, in memory order (little endian words)
+            red, green, blue = (2, 1, 0) if self.pixel_format == 'bgr0' else (0, 1, 2)
+            matrix = np.zeros((3, 4), np.float32)
+            matrix[:, red] = (0.257, -0.148, 0.439)
+            matrix[:, green] = (0.504, -0.291, -0.368)
+            matrix[:, blue] = (0.098, 0.439, -0.071)
+            offset = np.array(((16.5,), (128.5,), (128.5,)), np.float32)  # + 0.5 rounds
+            self._yuv = matrix, offset, np.empty((3, self.width * self.height), np.uint8)
+        matrix, offset, planes = self._yuv
+        pixels = np.frombuffer(frame, np.uint8).reshape(-1, 4)
+        # One matrix product converts the frame and leaves it planar
+        yuv = np.dot(matrix, pixels.T.astype(np.float32))
+        yuv += offset
+        np.copyto(planes, yuv, casting='unsafe')
+        self.output.write(b"FRAME\n")
+        self.output.write(planes)
+
+    def close(self):
+        if self.thread.is_alive():
+            self.filled_slots.put(None)
+            self.thread.join()
+        for view in self.slot_views:
+            view.release()
+        self.ring.close()
+        if self.output is not sys.stdout.buffer:
+            self.output.close()
+        else:
+            self.output.flush()
+        if self.error:
+            raise RuntimeError(f"frame recorder failed: {self.error}")
+
+    def ffmpeg_hint(self, path) -> str:
+        if self.y4m:
+            return f"ffmpeg -i {path} clip.mp4"
+        return (f"ffmpeg -f rawvideo -pix_fmt {self.pixel_format} -s {self.width}x{self.height} "
+                f"-r {self.fps} -i {path} clip.mp4")
+
+def render_replay(replay: Replay, path, config: Optional[GameConfig] = None) -> FrameRecorder:
+    """Draws every frame of a replay headless into a video, as fast as the renderer goes."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+    # Imported here so verifying or listing replays never loads pygame
+    import pygame
+    from giu_flappybird_game import FlappyBird
+
+    config = config or GameConfig(RECORD_HISTORY=False,
+                                  VALIDATE_GAPS=replay.validated_gaps)
+    game = FlappyBird(config)
+    try:
+        game.finish_startup()
+        game.reset_game(replay.seed)
+        recorder = FrameRecorder.for_surface(path, game.screen, config.FPS, drop=False)
+        try:
+            flap_frames = set(replay.flap_frames)
+            game.draw()
+            recorder.add(game.screen)
+            while game.sim.frame < replay.frames:
+                if not game.sim.step(game.sim.frame in flap_frames):
+                    game.draw()
+                    recorder.add(game.screen)
+                    break
+                game.draw()
+                recorder.add(game.screen)
+        finally:
+            recorder.close()
+    finally:
+        game.writer.close()
+        pygame.quit()
+    return recorder
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render Giu - Flappy Bird replays to video")
+    parser.add_argument('replays', nargs='+', type=Path,
+                        help="replay files or directories of .gfbr files")
+    parser.add_argument('--output-dir', type=Path, default=Path('.'),
+                        help="where to write the videos (default: current directory)")
+    parser.add_argument('--format', choices=('raw', 'y4m'), default='y4m',
+                        help="raw 32 bit frames or YUV 4:4:4 Y4M (default: %(default)s)")
+    parser.add_argument('--best', type=int, metavar='N',
+                        help="only render the N highest scoring replays")
+    args = parser.parse_args(argv)
+
+    replays = [(replay, replay_path) for replay_path, replay in load_replays(
+        args.replays, lambda path, error: print(f"{path}: unreadable ({error})"))]
+    if args.best:
+        replays = sorted(replays, key=lambda item: -item[0].score)[:args.best]
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    for replay, replay_path in replays:
+        output = args.output_dir / f"{replay_path.stem}.{args.format}"
+        start = time.perf_counter()
+        recorder = render_replay(replay, output)
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        print(f"{output}: {recorder.frames} frames in {elapsed:.2f}s "
+              f"({recorder.frames / recorder.fps / elapsed:.1f}x real time)")
+        if args.format == 'raw':
+            print(f"  encode with: {recorder.ffmpeg_hint(output)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+# by Giu
+# https://github.com/o-giu
+
+import os
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from giu_flappybird_sim import GameConfig, Simulation
+
+NOOP = 0
+FLAP = 1
+
+class FlappyBirdEnv:
+    """Reset/step environment for training agents, Gymnasium style.
+
+    ``reset(seed)`` returns ``(observation, info)`` and ``step(action)``
+    returns ``(observation, reward, terminated, truncated, info)``. An action
+    of ``FLAP`` flaps on the first of the ``frame_skip`` frames it covers.
+
+    Observations are float32 vectors ``[bird_y, velocity, pipe_x, gap_y]``
+    for the next pipe ahead, computed from the headless simulation without
+    pygame. With ``pixels=True`` a ``FlappyBird`` is created on the dummy
+    video driver and the observation is a ``(height, width, 3)`` uint8 view
+    of its screen from ``pygame.surfarray.pixels3d``, not a copy. The view
+    locks the screen and pygame cannot draw to a locked surface, so the
+    previous observation must be gone before the next ``step``::
+
+        obs, info = env.reset(seed)
+        while True:
+            action = policy(obs)
+            del obs   # Or keep obs.copy()
+            obs, reward, terminated, truncated, info = env.step(action)
+
+    ``step`` and ``reset`` check this before touching the game, so a
+    forgotten reference raises without losing a step. With ``copy=True``
+    each observation is a fresh array instead and the usual loop just works,
+    for one screen copy per step.
+    """
+
+    REWARD_PER_FRAME = 0.01   # For staying alive
+    REWARD_PER_PIPE = 1.0
+    REWARD_DEATH = -1.0
+
+    def __init__(self, config: Optional[GameConfig] = None, frame_skip: int = 1,
+                 pixels: bool = False, max_frames: Optional[int] = None,
+                 copy: bool = False):
+        if frame_skip < 1:
+            raise ValueError("frame_skip must be at least 1")
+        self.config = config or GameConfig(RECORD_HISTORY=False)
+        self.frame_skip = frame_skip
+        self.pixels = pixels
+        self.copy = copy
+        self.max_frames = max_frames
+        self.game = None
+        self._view = None
+
+        if pixels:
+            # Imported here so feature-only environments never load pygame
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+            os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+            from giu_flappybird_game import FlappyBird
+            self.game = FlappyBird(self.config)
+            self.sim = self.game.sim
+        else:
+            self.sim = Simulation(self.config)
+
+    @property
+    def observation_shape(self) -> Tuple[int, ...]:
+        if self.pixels:
+            return (self.config.WINDOW_SIZE[1], self.config.WINDOW_SIZE[0], 3)
+        return (4,)
+
+    def _features(self) -> np.ndarray:
+        bird = self.sim.bird
+        pipe = self.sim.next_pipe()
+        return np.array((bird.y, bird.velocity, pipe.x, pipe.gap_y), dtype=np.float32)
+
+    def _check_unlocked(self):
+        self._view = None  # Our reference to the last view, the caller must drop theirs
+        if self.game and self.game.screen.get_locked():
+            raise RuntimeError("the previous pixel observation is still alive and locks "
+                               "the screen, delete it (or keep a copy) before stepping, "
+                               "or create the environment with copy=True")
+
+    def _render(self) -> np.ndarray:
+        import pygame
+        self.game.draw()
+        # surfarray is indexed [x][y], transposing keeps it a view
+        view = pygame.surfarray.pixels3d(self.game.screen).transpose(1, 0, 2)
+        if self.copy:
+            return view.copy()  # The view goes with this frame and unlocks the screen
+        self._view = view
+        return view
+
+    def _observe(self) -> np.ndarray:
+        return self._render() if self.pixels else self._features()
+
+    def _info(self) -> Dict[str, int]:
+        return {'score': self.sim.score, 'frame': self.sim.frame, 'seed': self.sim.seed}
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, int]]:
+        self._check_unlocked()
+        if self.game:
+            self.game.reset_game(seed)
+        else:
+            self.sim.reset(seed)
+        return self._observe(), self._info()
+
+    def step(self, action: int) -> Tuple[np.ndarray, float, bool, bool, Dict[str, int]]:
+        sim = self.sim
+        if sim.game_over:
+            raise RuntimeError("step() called after the game ended, call reset() first")
+        self._check_unlocked()
+        score = sim.score
+        frames = 0
+        flap = action == FLAP
+        for _ in range(self.frame_skip):
+            if not sim.step(flap):
+                break
+            flap = False
+            frames += 1
+            if self.max_frames is not None and sim.frame >= self.max_frames:
+                break
+
+        terminated = sim.game_over
+        truncated = not terminated and self.max_frames is not None and sim.frame >= self.max_frames
+        reward = (frames * self.REWARD_PER_FRAME
+                  + (sim.score - score) * self.REWARD_PER_PIPE
+                  + (self.REWARD_DEATH if terminated else 0.0))
+        return self._observe(), reward, terminated, truncated, self._info()
+
+    def close(self):
+        self._view = None
+        if self.game:
+            import pygame
+            self.game.writer.close()
+            pygame.quit()
+            self.game = None
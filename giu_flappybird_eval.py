@@ -0,0 +1,168 @@
+# by Giu
+# https://github.com/o-giu
+
+import argparse
+import importlib
+import json
+import os
+import statistics
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from giu_flappybird_sim import GameConfig, Observation, Simulation
+
+Policy = Callable[[Observation], bool]
+
+def follow_gap(obs: Observation) -> bool:
+    """Example policy: flap whenever the bird drops below the middle of the next gap."""
+    return obs.bird_y > obs.gap_y
+
+def resolve_policy(spec: str) -> Policy:
+    """Imports a policy given as ``module:callable``."""
+    module_name, _, attribute = spec.partition(':')
+    if not attribute:
+        raise ValueError(f"policy must look like module:callable, got {spec!r}")
+    policy = importlib.import_module(module_name)
+    for name in attribute.split('.'):
+        policy = getattr(policy, name)
+    if not callable(policy):
+        raise ValueError(f"{spec} is not callable")
+    return policy
+
+def play(policy: Policy, seed: int, max_frames: int,
+         sim: Optional[Simulation] = None) -> Tuple[int, int]:
+    """Plays one headless game, returns (score, frames survived)."""
+    if sim is None:
+        sim = Simulation()
+    sim.reset(seed)
+    step, observe = sim.step, sim.observe
+    while sim.frame < max_frames and step(policy(observe())):
+        pass
+    return sim.score, sim.frame
+
+# Per worker process state, set once by the pool initializer
+_worker_policy: Policy = None
+_worker_sim: Simulation = None
+
+def _init_worker(policy_spec: str):
+    global _worker_policy, _worker_sim
+    _worker_policy = resolve_policy(policy_spec)
+    _worker_sim = Simulation(GameConfig())
+
+def _play_seeds(seeds: range, max_frames: int) -> Tuple[array, array]:
+    scores, frames = array('I'), array('I')
+    for seed in seeds:
+        score, survived = play(_worker_policy, seed, max_frames, _worker_sim)
+        scores.append(score)
+        frames.append(survived)
+    return scores, frames
+
+def evaluate(policy_spec: str, seed_start: int, games: int, max_frames: int,
+             workers: int = None, chunk_size: int = 500) -> Tuple[array, array]:
+    """Plays seeds ``seed_start .. seed_start + games`` across a process pool.
+
+    Returns the scores and survival frames in seed order.
+    """
+    chunks = [range(start, min(start + chunk_size, seed_start + games))
+              for start in range(seed_start, seed_start + games, chunk_size)]
+    scores, frames = array('I'), array('I')
+    if workers == 1:
+        _init_worker(policy_spec)
+        results = map(_play_seeds, chunks, [max_frames] * len(chunks))
+        for chunk_scores, chunk_frames in results:
+            scores.extend(chunk_scores)
+            frames.extend(chunk_frames)
+        return scores, frames
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(policy_spec,)) as pool:
+        results = pool.map(_play_seeds, chunks, [max_frames] * len(chunks))
+        for chunk_scores, chunk_frames in results:
+            scores.extend(chunk_scores)
+            frames.extend(chunk_frames)
+    return scores, frames
+
+def _percentile(values: List[float], q: float) -> float:
+    return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+def summarize(scores: array, frames: array, elapsed: float, max_frames: int,
+              fps: int) -> Dict[str, object]:
+    sorted_scores = sorted(scores)
+    survival = [f / fps for f in frames]
+    return {
+        'games': len(scores),
+        'elapsed_s': elapsed,
+        'games_per_s': len(scores) / elapsed,
+        'frames_per_s': sum(frames) / elapsed,
+        'score': {
+            'mean': statistics.fmean(scores),
+            'stdev': statistics.pstdev(scores),
+            'min': sorted_scores[0],
+            'p50': _percentile(sorted_scores, 50),
+            'p90': _percentile(sorted_scores, 90),
+            'p99': _percentile(sorted_scores, 99),
+            'max': sorted_scores[-1],
+        },
+        'survival_s': {
+            'mean': statistics.fmean(survival),
+            'p50': _percentile(sorted(survival), 50),
+            'max': max(survival),
+        },
+        'hit_frame_limit': sum(1 for f in frames if f >= max_frames),
+    }
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Evaluate a Giu - Flappy Bird autopilot over many seeds in parallel")
+    parser.add_argument('--policy', default='giu_flappybird_eval:follow_gap',
+                        help="module:callable taking an Observation and returning "
+                             "True to flap (default: %(default)s)")
+    parser.add_argument('--seed-start', type=int, default=0,
+                        help="first seed to play (default: %(default)s)")
+    parser.add_argument('--games', type=int, default=1000,
+                        help="number of consecutive seeds to play (default: %(default)s)")
+    parser.add_argument('--max-frames', type=int, default=60 * 60 * 10,
+                        help="stop a game after this many frames (default: %(default)s, 10 minutes)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="worker processes, 1 runs in this process (default: %(default)s)")
+    parser.add_argument('--chunk-size', type=int, default=500,
+                        help="seeds handed to a worker at a time (default: %(default)s)")
+    parser.add_argument('--json', metavar='PATH',
+                        help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    resolve_policy(args.policy)  # Fail fast before starting workers
+
+    start = time.perf_counter()
+    scores, frames = evaluate(args.policy, args.seed_start, args.games, args.max_frames,
+                              args.workers, args.chunk_size)
+    elapsed = max(time.perf_counter() - start, 1e-9)
+
+    report = summarize(scores, frames, elapsed, args.max_frames, GameConfig().FPS)
+    report['policy'] = args.policy
+    report['seeds'] = [args.seed_start, args.seed_start + args.games]
+
+    score, survival = report['score'], report['survival_s']
+    print(f"{report['games']} games of {args.policy} in {elapsed:.2f}s "
+          f"({report['games_per_s']:,.1f} games/s, {report['frames_per_s']:,.0f} frames/s)")
+    print(f"score     mean {score['mean']:.2f}  stdev {score['stdev']:.2f}  min {score['min']}  "
+          f"p50 {score['p50']}  p90 {score['p90']}  p99 {score['p99']}  max {score['max']}")
+    print(f"survival  mean {survival['mean']:.1f}s  p50 {survival['p50']:.1f}s  "
+          f"max {survival['max']:.1f}s  ({report['hit_frame_limit']} hit --max-frames)")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,179 +1,409 @@
 # by Giu
 # https://github.com/o-giu
 
+import time
+STARTUP_TIME = time.perf_counter()  # Taken before the heavy imports, see --report-startup
+
+import argparse
+import atexit
+import os
+# Keep pygame's banner off stdout, --capture - streams the video there
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
 import pygame
 import random
 import sys
 import math
+import threading
+import warnings
+from time import perf_counter
+from concurrent.futures import Future
 from enum import Enum, auto
 from typing import List, Tuple
-from dataclasses import dataclass
 from pathlib import Path
-from cryptography.fernet import Fernet
-
-@dataclass
-class GameConfig:
-    WINDOW_SIZE: Tuple[int, int] = (800, 600)
-    BIRD_SIZE: Tuple[int, int] = (40, 30)
-    PIPE_WIDTH: int = 80
-    GAP_SIZE: int = 200
-    COLORS: dict = None
-
-    def __post_init__(self):
-        self.COLORS = {
-            'background': (135, 206, 235),  # Sky blue
-            'bird': (255, 255, 0),         # Yellow
-            'pipe': (34, 139, 34),         # Forest green
-            'text': (255, 255, 255),       # White
-            'inactive_text': (128, 128, 128),  # Gray
-            'ground': (139, 69, 19)        # Brown
-        }
-
-class Bird:
-    def __init__(self, config: GameConfig):
+
+import giu_flappybird_sim as sim
+from giu_flappybird_sim import GameConfig, Simulation
+from giu_flappybird_replay import Replay
+from giu_flappybird_history import Run, RunHistory
+from giu_flappybird_profiler import (FrameProfiler, PHASE_INPUT, PHASE_UPDATE, PHASE_DRAW,
+                                     PHASE_BIRD_DRAW, PHASE_PIPE_DRAW, PHASE_FLIP,
+                                     PHASE_TICK, PHASE_SAVE, PHASE_GHOST_DRAW)
+from giu_flappybird_quality import (QualityGovernor, QUALITY_HIGH, QUALITY_MEDIUM,
+                                    QUALITY_NAMES)
+
+class BirdSprites:
+    """Every pose of the bird rendered and rotated once, looked up at draw time.
+
+    Poses are keyed by wing phase, blink state and the angle quantized to
+    ``ANGLE_STEP``. Bird angles are ``velocity * 3`` and the velocity moves
+    in half steps, so the default step covers every angle the game produces.
+    Wing phases that rasterize to the same pixels share their sprites.
+    """
+
+    ANGLE_STEP = 1.5
+    MIN_ANGLE = -30
+    MAX_ANGLE = 90
+
+    def __init__(self, config: GameConfig, colors: dict, wing_speed: int):
         self.config = config
-        self.wing_angle = 0
-        self.wing_speed = 8
-        self.eye_blink = 0
-        self.colors = {
-            'body': (255, 223, 0),     # Golden yellow
-            'wing': (255, 150, 0),     # Orange
-            'beak': (255, 69, 0),      # Red-orange
-            'eye': (0, 0, 0),          # Black
-            'eye_white': (255, 255, 255) # White
-        }
-        self.reset()
-        
-    def reset(self):
-        self.x = self.config.WINDOW_SIZE[0] // 3
-        self.y = self.config.WINDOW_SIZE[1] // 2
-        self.velocity = 0
-        self.gravity = 0.5
-        self.flap_strength = -6
-        self.rect = pygame.Rect(self.x, self.y, 
-                              self.config.BIRD_SIZE[0], 
-                              self.config.BIRD_SIZE[1])
-        self.angle = 0
-
-    def flap(self):
-        self.velocity = self.flap_strength
+        self.colors = colors
+        convert = pygame.display.get_surface() is not None
 
-    def update(self):
-        self.velocity += self.gravity
-        self.y += self.velocity
-        self.angle = max(-30, min(self.velocity * 3, 90))
-        self.rect.y = self.y
+        frames = {}
+        self.wing_frames = {}
+        wing_angle = 0
+        while wing_angle not in self.wing_frames:
+            wing_offset = abs(math.sin(math.radians(wing_angle))) * 5
+            key = pygame.image.tobytes(self._render_pose(wing_offset, False), 'RGBA')
+            self.wing_frames[wing_angle] = frames.setdefault(key, (len(frames), wing_offset))[0]
+            wing_angle = (wing_angle + wing_speed) % 360
 
-    def draw(self, screen):
-        # Create surface for rotation
+        steps = int((self.MAX_ANGLE - self.MIN_ANGLE) / self.ANGLE_STEP) + 1
+        self.poses = {}
+        for frame_index, wing_offset in frames.values():
+            for blinking in (False, True):
+                pose = self._render_pose(wing_offset, blinking)
+                rotations = []
+                for i in range(steps):
+                    rotated = pygame.transform.rotate(
+                        pose, -(self.MIN_ANGLE + i * self.ANGLE_STEP))
+                    if convert:
+                        rotated = rotated.convert_alpha()
+                    rotations.append((
+                        rotated,
+                        (rotated.get_width() - config.BIRD_SIZE[0]) // 2,
+                        (rotated.get_height() - config.BIRD_SIZE[1]) // 2))
+                self.poses[frame_index, blinking] = rotations
+
+    def _render_pose(self, wing_offset: float, blinking: bool) -> pygame.Surface:
+        width, height = self.config.BIRD_SIZE
         bird_surface = pygame.Surface(self.config.BIRD_SIZE, pygame.SRCALPHA)
-        
+
         # Body
-        pygame.draw.ellipse(bird_surface, self.colors['body'],
-                          (5, 0, self.config.BIRD_SIZE[0]-10, self.config.BIRD_SIZE[1]))
-        
-        # Wing animation
-        self.wing_angle = (self.wing_angle + self.wing_speed) % 360
-        wing_offset = abs(math.sin(math.radians(self.wing_angle))) * 5
+        pygame.draw.ellipse(bird_surface, self.colors['body'], (5, 0, width-10, height))
+
+        # Wing
         wing_points = [
-            (15, self.config.BIRD_SIZE[1]//2),
-            (5, self.config.BIRD_SIZE[1]//2 + wing_offset),
-            (15, self.config.BIRD_SIZE[1]//2 + wing_offset*2)
+            (15, height//2),
+            (5, height//2 + wing_offset),
+            (15, height//2 + wing_offset*2)
         ]
         pygame.draw.polygon(bird_surface, self.colors['wing'], wing_points)
-        
+
         # Beak
         pygame.draw.polygon(bird_surface, self.colors['beak'], [
-            (self.config.BIRD_SIZE[0]-10, self.config.BIRD_SIZE[1]//2-5),
-            (self.config.BIRD_SIZE[0], self.config.BIRD_SIZE[1]//2),
-            (self.config.BIRD_SIZE[0]-10, self.config.BIRD_SIZE[1]//2+5)
+            (width-10, height//2-5),
+            (width, height//2),
+            (width-10, height//2+5)
         ])
-        
-        # Eye animation (blinking)
-        self.eye_blink = max(0, self.eye_blink - 1)
-        if random.random() < 0.01:  # 1% chance to start blinking
-            self.eye_blink = 5
-            
-        if self.eye_blink == 0:
+
+        # Eye (open or blinking)
+        if not blinking:
             pygame.draw.circle(bird_surface, self.colors['eye_white'],
-                             (self.config.BIRD_SIZE[0]-15, self.config.BIRD_SIZE[1]//2-5), 5)
+                             (width-15, height//2-5), 5)
             pygame.draw.circle(bird_surface, self.colors['eye'],
-                             (self.config.BIRD_SIZE[0]-15, self.config.BIRD_SIZE[1]//2-5), 3)
+                             (width-15, height//2-5), 3)
         else:
             pygame.draw.line(bird_surface, self.colors['eye'],
-                           (self.config.BIRD_SIZE[0]-18, self.config.BIRD_SIZE[1]//2-5),
-                           (self.config.BIRD_SIZE[0]-12, self.config.BIRD_SIZE[1]//2-5), 2)
-        
-        # Rotate bird based on velocity
-        rotated_surface = pygame.transform.rotate(bird_surface, -self.angle)
-        screen.blit(rotated_surface, 
-                   (self.x - (rotated_surface.get_width() - self.config.BIRD_SIZE[0]) // 2,
-                    self.y - (rotated_surface.get_height() - self.config.BIRD_SIZE[1]) // 2))
-
-class Pipe:
-    def __init__(self, config: GameConfig, x: int):
-        self.config = config
-        self.x = x
-        self.base_speed = 3
-        self.speed = self.base_speed
-        self.passed = False
-        self.gap_y = random.randint(200, self.config.WINDOW_SIZE[1] - 200)
-        self.top_rect = pygame.Rect(x, 0, config.PIPE_WIDTH, 
-                                  self.gap_y - config.GAP_SIZE // 2)
-        self.bottom_rect = pygame.Rect(x, self.gap_y + config.GAP_SIZE // 2,
-                                     config.PIPE_WIDTH,
-                                     config.WINDOW_SIZE[1] - (self.gap_y + config.GAP_SIZE // 2))
-        self.shine_offset = random.randint(0, 360)
-
-    def draw(self, screen):
-        for rect in [self.top_rect, self.bottom_rect]:
-            # Main pipe body
-            pygame.draw.rect(screen, (34, 139, 34), rect)  # Dark green
-            
-            # Pipe edge
-            edge_rect = rect.copy()
-            edge_rect.width = 10
-            pygame.draw.rect(screen, (20, 80, 20), edge_rect)  # Darker green
-            
-            # Pipe highlight
-            highlight_rect = rect.copy()
-            highlight_rect.x += 10
-            highlight_rect.width = 5
-            pygame.draw.rect(screen, (50, 205, 50), highlight_rect)  # Light green
-            
-            # Moving shine effect
-            shine_y = (pygame.time.get_ticks() // 20 + self.shine_offset) % rect.height
-            shine_rect = pygame.Rect(rect.x + 20, rect.y + shine_y, 3, 20)
-            if shine_rect.bottom > rect.bottom:
-                shine_rect.height = rect.bottom - shine_rect.top
-            pygame.draw.rect(screen, (144, 238, 144), shine_rect)  # Light green shine
-
-            # Pipe top/bottom caps
-            cap_height = 20
-            if rect == self.top_rect:
-                cap_rect = pygame.Rect(rect.x - 5, rect.bottom - cap_height,
-                                     rect.width + 10, cap_height)
-            else:
-                cap_rect = pygame.Rect(rect.x - 5, rect.top,
-                                     rect.width + 10, cap_height)
-            pygame.draw.rect(screen, (20, 80, 20), cap_rect)  # Darker green for caps
+                           (width-18, height//2-5),
+                           (width-12, height//2-5), 2)
+        return bird_surface
+
+    def get(self, wing_angle: int, blinking: bool, angle: float) -> Tuple[pygame.Surface, int, int]:
+        """Returns the rotated sprite and how far it grew past BIRD_SIZE on each axis."""
+        angle = max(self.MIN_ANGLE, min(angle, self.MAX_ANGLE))
+        index = int(round((angle - self.MIN_ANGLE) / self.ANGLE_STEP))
+        return self.poses[self.wing_frames[wing_angle], blinking][index]
+
+class Bird(sim.Bird):
+    colors = {
+        'body': (255, 223, 0),     # Golden yellow
+        'wing': (255, 150, 0),     # Orange
+        'beak': (255, 69, 0),      # Red-orange
+        'eye': (0, 0, 0),          # Black
+        'eye_white': (255, 255, 255) # White
+    }
+    wing_speed = 8
+    sprites: BirdSprites = None
+    effects_rng = random.Random()  # Cosmetic only, FlappyBird seeds it per game
+
+    def __init__(self, config: GameConfig):
+        self.wing_angle = 0
+        self.eye_blink = 0
+        super().__init__(config)
+
+    @classmethod
+    def load_sprites(cls, config: GameConfig) -> BirdSprites:
+        # Call once the display exists so the sprites match its pixel format
+        cls.sprites = BirdSprites(config, cls.colors, cls.wing_speed)
+        return cls.sprites
 
     def update(self):
-        # Increase speed based on game progression (handled in FlappyBird class)
-        self.x -= self.speed
-        self.top_rect.x = self.x
-        self.bottom_rect.x = self.x
+        # Animations advance per simulation tick rather than per drawn
+        # frame, so they keep their speed at any render rate
+        super().update()
+
+        # Wing animation
+        self.wing_angle = (self.wing_angle + self.wing_speed) % 360
+
+        # Eye animation (blinking)
+        self.eye_blink = max(0, self.eye_blink - 1)
+        if self.effects_rng.random() < 0.01:  # 1% chance to start blinking
+            self.eye_blink = 5
+
+    def draw(self, screen, alpha: float = 1.0, detailed: bool = True):
+        """Draws the bird ``alpha`` of the way from its previous tick to its current one.
+
+        Without ``detailed`` the bird is drawn level and never blinks, the
+        unrotated sprite covers the fewest pixels.
+        """
+        sprites = self.sprites or self.load_sprites(self.config)
+        y = self.y - (self.y - self.prev_y) * (1.0 - alpha)
+
+        # Pre-rotated pose for the current velocity
+        if detailed:
+            sprite, grow_x, grow_y = sprites.get(self.wing_angle, self.eye_blink != 0, self.angle)
+        else:
+            sprite, grow_x, grow_y = sprites.get(self.wing_angle, False, 0)
+        return screen.blit(sprite, (self.x - grow_x, y - grow_y))
+
+class GhostSprites:
+    """Translucent copies of the bird's rotated poses, shared by every ghost.
+
+    The fade is multiplied into the per-pixel alpha once here, so drawing a
+    ghost is a plain alpha blit and all of them fit in one ``Surface.blits``
+    call. Ghosts never blink, only the open eye poses are copied.
+    """
+
+    ALPHA = 96
+
+    def __init__(self, bird_sprites: BirdSprites):
+        self.bird_sprites = bird_sprites
+        self.poses = {}
+        for (frame_index, blinking), rotations in bird_sprites.poses.items():
+            if blinking:
+                continue
+            faded_rotations = []
+            for sprite, grow_x, grow_y in rotations:
+                faded = sprite.copy()
+                faded.fill((255, 255, 255, self.ALPHA), special_flags=pygame.BLEND_RGBA_MULT)
+                faded_rotations.append((faded, grow_x, grow_y))
+            self.poses[frame_index] = faded_rotations
+
+    def add_blits(self, blits: list, ghosts, alpha: float = 1.0,
+                  detailed: bool = True) -> list:
+        """Appends a (sprite, dest) blit for every visible ghost of a ``GhostPack``.
+
+        Without ``detailed`` every ghost is drawn level, like the bird.
+        """
+        bird_sprites = self.bird_sprites
+        # Every ghost started on the same frame, so they share the wing phase
+        rotations = self.poses[bird_sprites.wing_frames[ghosts.frame * Bird.wing_speed % 360]]
+        shown = ghosts.visible.nonzero()[0]
+        ys = ghosts.y[shown]
+        ys -= (ys - ghosts.prev_y[shown]) * (1.0 - alpha)
+        if detailed:
+            indexes = ((ghosts.angles[shown] - bird_sprites.MIN_ANGLE)
+                       / bird_sprites.ANGLE_STEP).round().astype(int).tolist()
+        else:
+            flat = round(-bird_sprites.MIN_ANGLE / bird_sprites.ANGLE_STEP)
+            indexes = [flat] * len(shown)
+        x = ghosts.x
+        for index, y in zip(indexes, ys.tolist()):
+            sprite, grow_x, grow_y = rotations[index]
+            blits.append((sprite, (x - grow_x, y - grow_y)))
+        return blits
+
+class PipeSprites:
+    """Pipe body, cap and shine rendered once and cropped per pipe with blit areas.
+
+    The body is a full window height strip with the edge and highlight
+    already painted, so a pipe of any height is the top part of it.
+    """
+
+    CAP_HEIGHT = 20
+    SHINE_SIZE = (3, 20)
+
+    def __init__(self, config: GameConfig):
+        width = config.PIPE_WIDTH
+        convert = pygame.display.get_surface() is not None
+
+        self.body = pygame.Surface((width, config.WINDOW_SIZE[1]))
+        self.body.fill((34, 139, 34))  # Dark green
+        pygame.draw.rect(self.body, (20, 80, 20), (0, 0, 10, config.WINDOW_SIZE[1]))  # Darker green edge
+        pygame.draw.rect(self.body, (50, 205, 50), (10, 0, 5, config.WINDOW_SIZE[1]))  # Light green highlight
+
+        self.cap = pygame.Surface((width + 10, self.CAP_HEIGHT))
+        self.cap.fill((20, 80, 20))  # Darker green for caps
+
+        self.shine = pygame.Surface(self.SHINE_SIZE)
+        self.shine.fill((144, 238, 144))  # Light green shine
+
+        if convert:
+            self.body = self.body.convert()
+            self.cap = self.cap.convert()
+            self.shine = self.shine.convert()
+
+class Pipe(sim.Pipe):
+    __slots__ = ('shine_offset',)
+    sprites: PipeSprites = None
+    effects_rng = Bird.effects_rng
+
+    def reset(self, x: int, gap_y: int, gap_size: float = None):
+        super().reset(x, gap_y, gap_size)
+        self.shine_offset = self.effects_rng.randint(0, 360)
+
+    @classmethod
+    def load_sprites(cls, config: GameConfig) -> PipeSprites:
+        # Call once the display exists so the sprites match its pixel format
+        cls.sprites = PipeSprites(config)
+        return cls.sprites
+
+    def add_blits(self, blits: list, ticks: int, alpha: float = 1.0,
+                  shine: bool = True) -> list:
+        """Appends this pipe's (source, dest, area) blits to ``blits``.
+
+        The pipe is placed ``alpha`` of the way from its previous tick to
+        its current one. The moving shine is clipped to the part not
+        covered by the cap, so the blits need no particular order against
+        each other. ``shine=False`` leaves it out, two blits fewer.
+        """
+        sprites = self.sprites or self.load_sprites(self.config)
+        cap_height = sprites.CAP_HEIGHT
+        shine_width, shine_height = sprites.SHINE_SIZE
+        x = sim.rect_coord(self.x - (self.x - self.prev_x) * (1.0 - alpha))
+        shine_phase = ticks // 20 + self.shine_offset
+
+        # Top pipe, cap at its bottom
+        height = self.top_height
+        blits.append((sprites.body, (x, 0), (0, 0, self.config.PIPE_WIDTH, height)))
+        shine_y = shine_phase % height
+        visible = min(shine_height, height - shine_y, height - cap_height - shine_y)
+        if shine and visible > 0:
+            blits.append((sprites.shine, (x + 20, shine_y), (0, 0, shine_width, visible)))
+        blits.append((sprites.cap, (x - 5, height - cap_height)))
+
+        # Bottom pipe, cap at its top
+        top = self.bottom_y
+        height = self.config.WINDOW_SIZE[1] - top
+        blits.append((sprites.body, (x, top), (0, 0, self.config.PIPE_WIDTH, height)))
+        shine_y = shine_phase % height
+        hidden = max(0, cap_height - shine_y)
+        visible = min(shine_height, height - shine_y) - hidden
+        if shine and visible > 0:
+            blits.append((sprites.shine, (x + 20, top + shine_y + hidden),
+                          (0, hidden, shine_width, visible)))
+        blits.append((sprites.cap, (x - 5, top)))
+        return blits
+
+    def draw(self, screen, alpha: float = 1.0):
+        screen.blits(self.add_blits([], pygame.time.get_ticks(), alpha), doreturn=False)
+
+def wait_until(deadline: float):
+    """Sleeps until ``deadline`` (a perf_counter time), spinning the last millisecond.
+
+    ``time.sleep`` and ``Clock.tick`` can overshoot by a millisecond or more,
+    which is too coarse when input should be read right before a step.
+    """
+    remaining = deadline - perf_counter()
+    if remaining > 0.002:
+        time.sleep(remaining - 0.001)
+    while perf_counter() < deadline:
+        pass
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """Writes through a temp file and a rename, so a crash never leaves a torn file."""
+    temp_path = path.with_name(path.name + '.tmp')
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+class BackgroundWriter:
+    """Runs file writes on one daemon thread so the render loop never waits on disk.
+
+    Jobs submitted with the same ``key`` replace each other while still
+    pending, so a burst of saves only writes the latest one. ``flush`` waits
+    for everything queued so far and ``close`` (also run at exit) flushes
+    and stops the thread.
+    """
+
+    def __init__(self, name: str = 'background-writer'):
+        self._condition = threading.Condition()
+        self._pending = {}
+        self._busy = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, job, key=None):
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("writer is closed")
+            self._pending[object() if key is None else key] = job
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                key = next(iter(self._pending))
+                job = self._pending.pop(key)
+                self._busy = True
+            try:
+                job()
+            except Exception as e:
+                print(f"Error in background write: {e}", file=sys.stderr)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def flush(self, timeout: float = None) -> bool:
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._busy,
+                                            timeout)
+
+    def close(self, timeout: float = 10):
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
 
 class ScoreManager:
-    def __init__(self):
+    """Encrypted high score file.
+
+    Nothing happens on construction: the cryptography import, the key file
+    and the save directory are only touched by the first load or save,
+    which ``load_high_score_async`` runs on a background thread.
+    """
+
+    def __init__(self, writer: BackgroundWriter = None):
         self.save_dir = Path('save')
-        self.save_dir.mkdir(parents=True, exist_ok=True)
         self.key_file = self.save_dir / 'flappy_bird_score.key'
         self.score_file = self.save_dir / 'flappy_bird_score.encrypted'
-        self._initialize_encryption()
+        self.fernet = None
+        self.writer = writer
+        self._lock = threading.Lock()
+
+    def _get_fernet(self):
+        with self._lock:
+            if self.fernet is None:
+                self._initialize_encryption()
+            return self.fernet
 
     def _initialize_encryption(self):
+        # Imported on first use, it is the slowest import the game has
+        from cryptography.fernet import Fernet
         try:
+            self.save_dir.mkdir(parents=True, exist_ok=True)
             if self.key_file.exists():
                 self.key = self.key_file.read_bytes()
             else:
@@ -181,7 +411,7 @@ class ScoreManager:
                 self.key_file.write_bytes(self.key)
             self.fernet = Fernet(self.key)
         except Exception as e:
-            print(f"Error initializing encryption: {e}")
+            print(f"Error initializing encryption: {e}", file=sys.stderr)
             self.key = Fernet.generate_key()
             self.fernet = Fernet(self.key)
 
@@ -189,111 +419,446 @@ class ScoreManager:
         try:
             if self.score_file.exists():
                 encrypted_data = self.score_file.read_bytes()
-                decrypted_data = self.fernet.decrypt(encrypted_data)
+                decrypted_data = self._get_fernet().decrypt(encrypted_data)
                 return int(decrypted_data.decode())
         except Exception as e:
-            print(f"Error loading high score: {e}")
+            print(f"Error loading high score: {e}", file=sys.stderr)
         return 0
 
+    def load_high_score_async(self) -> Future:
+        """Loads the high score on a daemon thread, the future resolves to it."""
+        future = Future()
+        def load():
+            try:
+                future.set_result(self.load_high_score())
+            except Exception as e:
+                print(f"Error loading high score: {e}", file=sys.stderr)
+                future.set_result(0)
+        threading.Thread(target=load, name='high-score-loader', daemon=True).start()
+        return future
+
     def save_high_score(self, score: int):
         try:
-            encrypted_data = self.fernet.encrypt(str(score).encode())
-            self.score_file.write_bytes(encrypted_data)
+            encrypted_data = self._get_fernet().encrypt(str(score).encode())
+            atomic_write_bytes(self.score_file, encrypted_data)
         except Exception as e:
-            print(f"Error saving high score: {e}")
+            print(f"Error saving high score: {e}", file=sys.stderr)
+
+    def save_high_score_async(self, score: int):
+        """Queues the save on the writer, replacing any save still pending."""
+        if self.writer is None:
+            self.save_high_score(score)
+        else:
+            self.writer.submit(lambda: self.save_high_score(score), key='high_score')
+
+class DirtyRectRenderer:
+    """Keeps the static background cached and only pushes regions that changed.
+
+    Each frame ``restore`` paints the background back over what was drawn the
+    previous frame, and ``present`` updates the display with the union of the
+    old and new regions. ``invalidate`` forces one full repaint, e.g. after
+    a menu has drawn over the whole screen.
+    """
+
+    def __init__(self, screen: pygame.Surface, config: GameConfig,
+                 display: 'ScaledDisplay' = None):
+        self.screen = screen
+        self.display = display
+        self.background = pygame.Surface(config.WINDOW_SIZE).convert()
+        self.background.fill(config.COLORS['background'])
+        pygame.draw.rect(self.background, config.COLORS['ground'],
+                        (0, config.WINDOW_SIZE[1] - 20,
+                         config.WINDOW_SIZE[0], 20))
+        self.previous_rects: List[pygame.Rect] = []
+        self.full_redraw = True
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def restore(self):
+        if self.full_redraw:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in self.previous_rects:
+                self.screen.blit(self.background, rect, rect)
+
+    def present(self, drawn_rects: List[pygame.Rect]):
+        if self.display:
+            # Scaled output is presented whole, restore still saves the full background blit
+            self.display.present()
+            self.full_redraw = False
+        elif self.full_redraw:
+            pygame.display.flip()
+            self.full_redraw = False
+        else:
+            pygame.display.update(self.previous_rects + drawn_rects)
+        self.previous_rects = drawn_rects
+
+class ScaledDisplay:
+    """Fixed ``WINDOW_SIZE`` canvas scaled once per frame to a window of any size.
+
+    Everything draws to ``canvas`` at the game's own resolution, so drawing
+    costs the same on a 4K screen as in the default window and only the
+    final ``pygame.transform.scale`` grows with the display. The canvas
+    keeps its aspect ratio, letterboxed in black, and is scaled straight
+    into a subsurface of the window. F11 toggles fullscreen.
+    """
+
+    def __init__(self, config: GameConfig):
+        self.config = config
+        self.fullscreen = config.FULLSCREEN
+        self._set_mode()
+        self.canvas = pygame.Surface(config.WINDOW_SIZE).convert()
+
+    def _set_mode(self):
+        if self.fullscreen:
+            size, flags = (0, 0), pygame.FULLSCREEN  # Desktop resolution
+        else:
+            size = self.config.WINDOW_SIZE
+            flags = pygame.RESIZABLE if self.config.RESIZABLE else 0
+        # No vsync: SDL ignores it without SCALED or OPENGL, so FlappyBird
+        # caps the render rate for this window instead
+        pygame.display.set_mode(size, flags)
+        self._layout()
+
+    def _layout(self):
+        self.window = pygame.display.get_surface()
+        window_width, window_height = self.window.get_size()
+        width, height = self.config.WINDOW_SIZE
+        scale = min(window_width / width, window_height / height)
+        self.viewport = pygame.Rect(0, 0, max(1, int(width * scale)), max(1, int(height * scale)))
+        self.viewport.center = (window_width // 2, window_height // 2)
+        self.window.fill((0, 0, 0))
+        # None when the window is the canvas size and a plain blit will do
+        self.target = (None if self.viewport.size == (width, height)
+                       else self.window.subsurface(self.viewport))
+
+    def toggle_fullscreen(self):
+        self.fullscreen = not self.fullscreen
+        self._set_mode()
+
+    def handle_event(self, event) -> bool:
+        """Follows window resizes and F11. Returns True if the window needs repainting."""
+        if event.type in (pygame.VIDEORESIZE, pygame.WINDOWSIZECHANGED):
+            self._layout()
+            return True
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
+            self.toggle_fullscreen()
+            return True
+        return False
+
+    def present(self):
+        if self.target is None:
+            self.window.blit(self.canvas, self.viewport)
+        else:
+            pygame.transform.scale(self.canvas, self.viewport.size, self.target)
+        pygame.display.flip()
 
 class FlappyBird:
-    def __init__(self):
-        pygame.init()
-        self.config = GameConfig()
-        self.screen = pygame.display.set_mode(self.config.WINDOW_SIZE)
+    def __init__(self, config: GameConfig = None):
+        self.startup_marks = {'imports': perf_counter()}
+        # Only what the game uses, pygame.init() would also open the audio device
+        pygame.display.init()
+        pygame.font.init()
+        self.config = config or GameConfig()
+        self.display = None
+        self.vsync = False  # Whether presenting really waits for the display
+        if self.config.SCALE_TO_WINDOW:
+            self.display = ScaledDisplay(self.config)
+            self.screen = self.display.canvas
+        elif self.config.VSYNC:
+            self.screen = self._set_vsync_mode()
+        else:
+            self.screen = pygame.display.set_mode(self.config.WINDOW_SIZE)
+        # --vsync leaves the render rate uncapped for the display to pace,
+        # without working vsync that would spin a core, so cap at the step rate
+        self.render_fps = self.config.RENDER_FPS
+        if self.config.VSYNC and not self.vsync:
+            self.render_fps = self.render_fps or self.config.FPS
+            print(f"Vsync is not available, rendering at up to {self.render_fps} fps",
+                  file=sys.stderr)
         pygame.display.set_caption("Giu - Flappy Bird v1.0")
         self.clock = pygame.time.Clock()
         self.font = pygame.font.Font(None, 36)
 
-        self.start_time = pygame.time.get_ticks()
-        self.difficulty_factor = 1.0
-        
-        self.score_manager = ScoreManager()
-        self.high_score = self.score_manager.load_high_score()
+        self.recorder = None
+        if self.config.CAPTURE:
+            # Imported here, only capturing needs it
+            from giu_flappybird_capture import FrameRecorder
+            self.recorder = FrameRecorder.for_surface(self.config.CAPTURE, self.screen,
+                                                      self.config.FPS, drop=True)
+
+        self.renderer = (DirtyRectRenderer(self.screen, self.config, self.display)
+                         if self.config.DIRTY_RECTS else None)
+        # None unless profiling, so the run loop only pays for a None check
+        self.profiler = FrameProfiler() if self.config.PROFILE else None
+        self.profiler_text = None
+        # Budget is the render interval, or the step interval when uncapped
+        quality = self.config.QUALITY
+        self.governor = QualityGovernor(
+            1.0 / (self.render_fps or self.config.FPS),
+            QUALITY_HIGH if quality == 'auto' else QUALITY_NAMES.index(quality),
+            adaptive=quality == 'auto')
+        self.present_start = 0.0
+
+        self.sim = Simulation(self.config, bird_cls=Bird, pipe_cls=Pipe)
+        self.ghosts = None
+        self.ghost_sprites = None
+        self.race_seed = None
+        if self.config.RACE:
+            # Imported here, only race mode needs NumPy
+            from giu_flappybird_ghosts import GhostPack, load_race
+            self.race_seed, replays = load_race(self.config.RACE, self.config,
+                                                self.config.MAX_GHOSTS)
+            if replays:
+                self.ghosts = GhostPack(replays, self.config)
+            else:
+                print(f"No replays to race in {self.config.RACE}", file=sys.stderr)
+        # Fixed timestep: the simulation advances in 1 / FPS steps whatever the render rate
+        self.step_time = 1.0 / self.config.FPS
+        self.accumulator = 0.0
+        self.last_time = perf_counter()
+
+        self.writer = BackgroundWriter()
+        self.score_manager = ScoreManager(self.writer)
+        self.history = RunHistory() if self.config.RECORD_HISTORY else None
+        self._high_score = None
+        self.high_score_future = self.score_manager.load_high_score_async()
+        self.high_score_future.add_done_callback(
+            lambda future: self.startup_marks.setdefault('high_score', perf_counter()))
         self.reset_game()
+        self.startup_marks['init'] = perf_counter()
 
-    def reset_game(self):
-        self.bird = Bird(self.config)
-        self.pipes = []
-        self.spawn_pipe()
-        self.score = 0
-        self.game_over = False
-        self.start_time = pygame.time.get_ticks()
-        self.difficulty_factor = 1.0
+    def _set_vsync_mode(self) -> pygame.Surface:
+        # SDL only honours vsync through the renderer that SCALED sets up. It
+        # raises where vsync is unavailable, and only warns when it falls back
+        # to a software window that cannot sync, so that counts as failing too.
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                screen = pygame.display.set_mode(self.config.WINDOW_SIZE, pygame.SCALED, vsync=1)
+        except (pygame.error, Warning):
+            return pygame.display.set_mode(self.config.WINDOW_SIZE)
+        self.vsync = True
+        try:
+            # SCALED also grows the window by the largest integer factor the
+            # desktop fits, put it back to the game's size
+            from pygame._sdl2.video import Window
+            Window.from_display_module().size = self.config.WINDOW_SIZE
+        except (ImportError, pygame.error):
+            pass
+        return screen
+
+    @property
+    def high_score(self) -> int:
+        # Shown as 0 until the background load finishes
+        if self._high_score is None:
+            if not self.high_score_future.done():
+                return 0
+            self._high_score = self.high_score_future.result()
+        return self._high_score
+
+    @high_score.setter
+    def high_score(self, value: int):
+        self._high_score = value
+
+    def finish_startup(self):
+        """Runs once the menu is on screen: warms the sprite caches, reports timings."""
+        self.startup_marks['first_frame'] = perf_counter()
+        Bird.load_sprites(self.config)
+        Pipe.load_sprites(self.config)
+        if self.ghosts:
+            self.ghost_sprites = GhostSprites(Bird.sprites)
+        self.startup_marks['sprites'] = perf_counter()
+        if self.config.REPORT_STARTUP:
+            self.report_startup()
+
+    def report_startup(self):
+        def since_start(mark: str) -> str:
+            return f"{(self.startup_marks[mark] - STARTUP_TIME) * 1000:.1f} ms"
+        print(f"Startup: imports {since_start('imports')}, init {since_start('init')}, "
+              f"first frame {since_start('first_frame')}, sprites ready {since_start('sprites')}",
+              file=sys.stderr)
+        def report_high_score(future: Future):
+            print(f"Startup: high score loaded at {since_start('high_score')}", file=sys.stderr)
+        self.high_score_future.add_done_callback(report_high_score)
+
+    # The game state lives in the headless simulation, FlappyBird renders it
+    @property
+    def quality(self) -> int:
+        return self.governor.level
+
+    @property
+    def bird(self) -> Bird:
+        return self.sim.bird
+
+    @property
+    def pipes(self) -> sim.PipePool:
+        return self.sim.pipes
+
+    @property
+    def score(self) -> int:
+        return self.sim.score
+
+    @property
+    def game_over(self) -> bool:
+        return self.sim.game_over
+
+    @property
+    def difficulty_factor(self) -> float:
+        return self.sim.difficulty_factor
+
+    def reset_game(self, seed: int = None):
+        # Cosmetic effects are seeded from the game seed too, so replays render identically
+        if seed is None:
+            # Races are always on the ghosts' pipe layout
+            seed = self.race_seed if self.ghosts else random.getrandbits(63)
+        Bird.effects_rng.seed(seed)
+        self.sim.reset(seed)
+        if self.ghosts:
+            self.ghosts.reset()
+        if self.renderer:
+            self.renderer.invalidate()
 
     def spawn_pipe(self):
-        self.pipes.append(Pipe(self.config, self.config.WINDOW_SIZE[0]))
+        self.sim.spawn_pipe()
+
+    def reset_timestep(self):
+        """Restarts the step clock, so time spent in a menu is not simulated."""
+        self.accumulator = 0.0
+        self.last_time = perf_counter()
+
+    def due_steps(self) -> int:
+        """Number of simulation steps owed for the time since the last call."""
+        now = perf_counter()
+        self.accumulator += now - self.last_time
+        self.last_time = now
+        steps = int(self.accumulator / self.step_time)
+        if steps > self.config.MAX_STEPS_PER_FRAME:
+            # Too far behind (a stall or a slow machine), drop the backlog
+            # instead of spending ever longer catching up
+            steps = self.config.MAX_STEPS_PER_FRAME
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step_time
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """How far the display is between the last step and the next one."""
+        return min(self.accumulator / self.step_time, 1.0)
+
+    def poll_flaps(self):
+        """Reads only key presses, for low latency input right before a step.
+
+        Other keys are put back for ``handle_input`` at the start of the frame.
+        """
+        for event in pygame.event.get(pygame.KEYDOWN):
+            if event.key == pygame.K_SPACE:
+                self.sim.flap()
+            else:
+                pygame.event.post(event)
 
     def handle_input(self):
         for event in pygame.event.get():
+            if self.display and self.display.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
                 return "quit"
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     return "pause"
                 elif event.key == pygame.K_SPACE:
-                    self.bird.flap()
+                    self.sim.flap()
         return "continue"
 
     def update(self):
-        if self.game_over:
-            return
+        self.sim.step()
+        if self.ghosts:
+            self.ghosts.step()
 
-        self.bird.update()
+    def save_replay(self):
+        replay_dir = Path(self.config.REPLAY_DIR)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{self.sim.seed:x}-{self.score}.gfbr"
+        data = Replay.from_simulation(self.sim).to_bytes()
+        def write():
+            replay_dir.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(replay_dir / name, data)
+        self.writer.submit(write)
 
-        # Update difficulty based on time
-        elapsed_time = (pygame.time.get_ticks() - self.start_time) / 1000  # seconds
-        self.difficulty_factor = min(3.0, 1.0 + elapsed_time / 30)
-        
-        # Apply difficulty to pipe speed and gap size
-        for pipe in self.pipes:
-            pipe.speed = pipe.base_speed * self.difficulty_factor
-            pipe.config.GAP_SIZE = max(120, 200 - (self.difficulty_factor - 1) * 100)  # Shrink gap size
+    def save_run(self):
+        run = Run(time.time(), self.score, self.sim.frame, self.sim.seed)
+        self.writer.submit(lambda: self.history.append(run))
 
-        # Spawn new pipes
-        if not self.pipes or self.pipes[-1].x < self.config.WINDOW_SIZE[0] - 500:
-            self.spawn_pipe()
+    def capture_frame(self, count: int = 1):
+        try:
+            for _ in range(count):
+                self.recorder.add(self.screen)
+        except RuntimeError:
+            # The output failed (a full disk, the encoder went away), the
+            # session goes on without capturing
+            self.stop_capture()
 
-        # Update pipes
-        for pipe in self.pipes:
-            pipe.update()
-            
-            # Score when passing pipes
-            if not pipe.passed and pipe.x + self.config.PIPE_WIDTH < self.bird.x:
-                pipe.passed = True
-                self.score += 1
+    def stop_capture(self):
+        recorder, self.recorder = self.recorder, None
+        # Reported on stderr, stdout may be the video itself
+        try:
+            recorder.close()
+        except (OSError, RuntimeError) as e:
+            print(f"Capture to {self.config.CAPTURE} stopped after {recorder.frames} frames: {e}",
+                  file=sys.stderr)
+        else:
+            print(f"Captured {recorder.frames} frames to {self.config.CAPTURE} "
+                  f"({recorder.dropped} dropped)", file=sys.stderr)
+
+    def draw(self, alpha: float = 1.0):
+        """Draws the game ``alpha`` of the way from the previous step to the last one."""
+        if self.renderer:
+            self.renderer.restore()
+        else:
+            self.screen.fill(self.config.COLORS['background'])
 
-        # Remove off-screen pipes
-        self.pipes = [pipe for pipe in self.pipes if pipe.x + self.config.PIPE_WIDTH > 0]
+            # Draw ground
+            pygame.draw.rect(self.screen, self.config.COLORS['ground'],
+                            (0, self.config.WINDOW_SIZE[1] - 20, 
+                             self.config.WINDOW_SIZE[0], 20))
 
-        # Check collisions
-        if (self.bird.y < 0 or 
-            self.bird.y + self.config.BIRD_SIZE[1] > self.config.WINDOW_SIZE[1]):
-            self.game_over = True
+        profiler = self.profiler
+        if profiler:
+            pipes_start = perf_counter()
 
+        # All pipes in one batched blit. The shine runs on simulation time,
+        # so replays rendered offline look the same as live play
+        ticks = self.sim.frame * 1000 // self.config.FPS
+        shine = self.quality >= QUALITY_HIGH
+        pipe_blits = []
         for pipe in self.pipes:
-            if (pipe.top_rect.colliderect(self.bird.rect) or 
-                pipe.bottom_rect.colliderect(self.bird.rect)):
-                self.game_over = True
+            pipe.add_blits(pipe_blits, ticks, alpha, shine)
+        drawn_rects = self.screen.blits(pipe_blits, doreturn=self.renderer is not None)
 
-    def draw(self):
-        self.screen.fill(self.config.COLORS['background'])
-        
-        # Draw ground
-        pygame.draw.rect(self.screen, self.config.COLORS['ground'],
-                        (0, self.config.WINDOW_SIZE[1] - 20, 
-                         self.config.WINDOW_SIZE[0], 20))
+        if profiler:
+            ghosts_start = perf_counter()
+            profiler.add(PHASE_PIPE_DRAW, ghosts_start - pipes_start)
 
-        for pipe in self.pipes:
-            pipe.draw(self.screen)
-            
-        self.bird.draw(self.screen)
+        if self.ghosts:
+            # Behind the player's bird, all ghosts in one batched blit
+            if self.ghost_sprites is None:
+                self.ghost_sprites = GhostSprites(Bird.sprites or Bird.load_sprites(self.config))
+            ghost_blits = self.ghost_sprites.add_blits([], self.ghosts, alpha,
+                                                       self.quality >= QUALITY_MEDIUM)
+            ghost_rects = self.screen.blits(ghost_blits, doreturn=self.renderer is not None)
+            if self.renderer:
+                drawn_rects.extend(ghost_rects)
+
+        if profiler:
+            bird_start = perf_counter()
+            if self.ghosts:
+                profiler.add(PHASE_GHOST_DRAW, bird_start - ghosts_start)
+
+        bird_rect = self.bird.draw(self.screen, alpha, self.quality >= QUALITY_MEDIUM)
+
+        if profiler:
+            profiler.add(PHASE_BIRD_DRAW, perf_counter() - bird_start)
 
         # Draw score
         score_text = self.font.render(f'Score: {self.score}', True, 
@@ -301,87 +866,255 @@ class FlappyBird:
         high_score_text = self.font.render(f'High Score: {self.high_score}', True, 
                                          self.config.COLORS['text'])
         
-        self.screen.blit(score_text, (10, 10))
-        self.screen.blit(high_score_text, (self.config.WINDOW_SIZE[0] - 200, 10))
+        score_rect = self.screen.blit(score_text, (10, 10))
+        high_score_rect = self.screen.blit(high_score_text, (self.config.WINDOW_SIZE[0] - 200, 10))
 
-        pygame.display.flip()
+        if profiler and self.config.PROFILE_OVERLAY:
+            overlay_rect = self.draw_profiler_overlay()
+            if self.renderer:
+                drawn_rects.append(overlay_rect)
+
+        if profiler:
+            profiler.lap(PHASE_DRAW)
+
+        self.present_start = perf_counter()
+        if self.renderer:
+            drawn_rects.extend((bird_rect, score_rect, high_score_rect))
+            self.renderer.present(drawn_rects)
+        elif self.display:
+            self.display.present()
+        else:
+            pygame.display.flip()
+
+        if profiler:
+            profiler.lap(PHASE_FLIP)
+
+    def draw_profiler_overlay(self) -> pygame.Rect:
+        # Percentiles are only recomputed twice a second
+        profiler = self.profiler
+        if self.profiler_text is None or profiler.frames % 30 == 0:
+            p50, p99 = profiler.percentiles(50, 99)
+            self.profiler_text = self.font.render(
+                f'{profiler.last_frame * 1000:.1f} ms  p50 {p50 * 1000:.1f}  p99 {p99 * 1000:.1f}',
+                True, self.config.COLORS['text'])
+        return self.screen.blit(self.profiler_text, (10, 40))
 
     def run(self):
         try:
             while True:
-                menu = Menu(self.screen, self.font, self.config)
-                menu_running = True
-                while menu_running:
-                    menu.draw()
-                    selection = menu.handle_input()
-                    if selection == 0:  # Start Game
-                        menu_running = False
-                    elif selection == 1:  # Quit
-                        return
+                menu = Menu(self.screen, self.font, self.config, self.display,
+                            detailed_title=self.quality >= QUALITY_HIGH)
+                first_menu = 'first_frame' not in self.startup_marks
+                selection = menu.choose(self.finish_startup if first_menu else None)
+                if selection == 1:  # Quit
+                    return
 
                 self.reset_game()
+                self.reset_timestep()
                 game_running = True
                 
+                profiler = self.profiler
+                low_latency = self.config.LOW_LATENCY_INPUT
                 while game_running:
+                    frame_start = perf_counter()
+                    if profiler:
+                        profiler.start_frame()
+
                     input_result = self.handle_input()
-                    
+
+                    if profiler:
+                        profiler.lap(PHASE_INPUT)
+
                     if input_result == "quit":
                         return
                     elif input_result == "pause":
-                        pause_menu = PauseMenu(self.screen, self.font, self.config)
-                        paused = True
-                        while paused:
-                            pause_menu.draw()
-                            pause_selection = pause_menu.handle_input()
-                            if pause_selection == 0:  # Return to Game
-                                paused = False
-                            elif pause_selection == 1:  # Back to Menu
-                                game_running = False
-                                paused = False
-                            elif pause_selection == 2:  # Quit
-                                return
+                        pause_menu = PauseMenu(self.screen, self.font, self.config, self.display)
+                        pause_selection = pause_menu.choose()
+                        if pause_selection == 0:  # Return to Game
+                            if self.renderer:
+                                self.renderer.invalidate()
+                        elif pause_selection == 1:  # Back to Menu
+                            game_running = False
+                        elif pause_selection == 2:  # Quit
+                            return
+                        self.reset_timestep()
+                        frame_start = perf_counter()
+                        if profiler:
+                            profiler.start_frame()
 
                     if not game_running:
                         break
 
                     if not self.game_over:
-                        self.update()
-                        self.draw()
+                        steps = self.due_steps()
+                        first_frame = self.sim.frame
+                        for step in range(steps):
+                            if low_latency and step:
+                                # Catch-up steps read input again instead of
+                                # applying it all to the first step
+                                self.poll_flaps()
+                            self.update()
+                            if self.game_over:
+                                break
+                        if profiler:
+                            profiler.lap(PHASE_UPDATE)
+                        self.draw(self.alpha)
+                        # Work only: with vsync the present waits for the display
+                        self.governor.sample((self.present_start if self.vsync
+                                              else perf_counter()) - frame_start)
+                        if self.recorder:
+                            # The video runs at FPS, so each step taken needs
+                            # a frame even when several share one draw
+                            self.capture_frame(self.sim.frame - first_frame)
                     else:
+                        self.high_score_future.result()  # Compare against the real high score
                         if self.score > self.high_score:
                             self.high_score = self.score
-                            self.score_manager.save_high_score(self.high_score)
-                            
+                            self.score_manager.save_high_score_async(self.high_score)
+                        if self.config.REPLAY_DIR:
+                            self.save_replay()
+                        if self.history is not None:
+                            self.save_run()
+                        if profiler:
+                            profiler.lap(PHASE_SAVE)
+                            profiler.end_frame()
+
                         game_over = GameOver(self.screen, self.font, 
-                                           self.config, self.score)
-                        game_over_running = True
-                        while game_over_running:
-                            game_over.draw()
-                            game_over_selection = game_over.handle_input()
-                            if game_over_selection == 0:  # Play Again
-                                self.reset_game()
-                                game_over_running = False
-                            elif game_over_selection == 1:  # Main Menu
-                                game_running = False
-                                game_over_running = False
-                            elif game_over_selection == 2:  # Quit
-                                return
-
-                    self.clock.tick(60)
+                                           self.config, self.score, self.display)
+                        game_over_selection = game_over.choose()
+                        if profiler:
+                            profiler.start_frame()
+                        self.governor.restart()
+                        if game_over_selection == 0:  # Play Again
+                            self.reset_game()
+                            self.reset_timestep()
+                        elif game_over_selection == 1:  # Main Menu
+                            game_running = False
+                        elif game_over_selection == 2:  # Quit
+                            return
+
+                    if low_latency:
+                        # Wake exactly when the next step is due, so the
+                        # input read at the top of the frame is fresh
+                        deadline = self.last_time + self.step_time - self.accumulator
+                        if self.render_fps:
+                            deadline = min(deadline, frame_start + 1.0 / self.render_fps)
+                        wait_until(deadline)
+                    else:
+                        self.clock.tick(self.render_fps)
+
+                    if profiler:
+                        profiler.lap(PHASE_TICK)
+                        profiler.end_frame()
 
         finally:
+            self.writer.close()
+            if self.recorder:
+                self.stop_capture()
+            if self.history is not None:
+                self.history.close()
+            if self.profiler:
+                self.profiler.close()
+                if self.config.PROFILE_EXPORT:
+                    self.profiler.export(self.config.PROFILE_EXPORT)
             pygame.quit()
 
-class Menu:
-    def __init__(self, screen, font, config):
+class OptionMenu:
+    """Option list shared by the menus, driven by events instead of a busy loop.
+
+    ``choose`` blocks on ``pygame.event.wait`` and only redraws when the
+    selection changes or the window needs repainting. Option text is
+    rendered once for both the selected and the inactive color. With a
+    ``ScaledDisplay`` the menu draws to its canvas and presents through it.
+    """
+
+    IDLE_TIMEOUT_MS = 250
+    options: List[str] = []
+    options_y = 250      # Center of the first option
+    escape_choice = 1    # Returned on Escape
+    quit_choice = 1      # Returned when the window is closed
+
+    def __init__(self, screen, font, config, display=None):
         self.screen = screen
         self.font = font
         self.config = config
-        self.options = ["Start Game", "Quit"]
+        self.display = display
+        self.present = display.present if display else pygame.display.flip
         self.selected_index = 0
-        self._initialize_title()
+        self.needs_redraw = True
+        self.option_surfaces = [
+            (font.render(option, True, config.COLORS['text']),
+             font.render(option, True, config.COLORS['inactive_text']))
+            for option in self.options
+        ]
+
+    def draw_title(self):
+        pass
+
+    def draw(self):
+        self.screen.fill(self.config.COLORS['background'])
+        self.draw_title()
+
+        for i, (active_text, inactive_text) in enumerate(self.option_surfaces):
+            option_text = active_text if i == self.selected_index else inactive_text
+            option_rect = option_text.get_rect(
+                center=(self.config.WINDOW_SIZE[0] // 2, self.options_y + i * 50))
+            self.screen.blit(option_text, option_rect)
+
+        self.present()
+        self.needs_redraw = False
+
+    def handle_input(self) -> int:
+        event = pygame.event.wait(self.IDLE_TIMEOUT_MS)
+        if event.type == pygame.NOEVENT:
+            return -1
+        for event in [event] + pygame.event.get():
+            if self.display and self.display.handle_event(event):
+                self.needs_redraw = True
+                continue
+            if event.type == pygame.QUIT:
+                return self.quit_choice
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.needs_redraw = True
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_UP:
+                    self.selected_index = (self.selected_index - 1) % len(self.options)
+                    self.needs_redraw = True
+                elif event.key == pygame.K_DOWN:
+                    self.selected_index = (self.selected_index + 1) % len(self.options)
+                    self.needs_redraw = True
+                elif event.key == pygame.K_RETURN:
+                    return self.selected_index
+                elif event.key == pygame.K_ESCAPE:
+                    return self.escape_choice
+        return -1
+
+    def choose(self, on_first_draw=None) -> int:
+        """Blocks until an option is picked and returns its index.
+
+        ``on_first_draw`` runs once right after the menu is first shown.
+        """
+        while True:
+            if self.needs_redraw:
+                self.draw()
+                if on_first_draw:
+                    on_first_draw()
+                    on_first_draw = None
+            selection = self.handle_input()
+            if selection != -1:
+                return selection
+
+class Menu(OptionMenu):
+    options = ["Start Game", "Quit"]
+    options_y = 250
+    escape_choice = 1
+    quit_choice = 1
+
+    def __init__(self, screen, font, config, display=None, detailed_title: bool = True):
+        super().__init__(screen, font, config, display)
+        self._initialize_title(detailed_title)
         
-    def _initialize_title(self):
+    def _initialize_title(self, detailed: bool = True):
         title = "Giu - Flappy Bird v1.0"
         gradient_colors = [
             (255, 255, 0),  # Yellow
@@ -390,6 +1123,13 @@ class Menu:
         ]
         
         title_font = pygame.font.Font(None, 72)
+        if not detailed:
+            # One render and one blit instead of one per letter, in the middle color
+            surface = title_font.render(title, True, gradient_colors[1])
+            self.title_surfaces = [(surface, 0)]
+            self.title_total_width = surface.get_width()
+            return
+
         self.title_surfaces = []
         total_width = 0
         
@@ -411,135 +1151,125 @@ class Menu:
         
         self.title_total_width = total_width
 
-    def draw(self):
-        self.screen.fill(self.config.COLORS['background'])
-        
+    def draw_title(self):
         title_start_x = (self.config.WINDOW_SIZE[0] - self.title_total_width) // 2
         title_y = 100
         for surface, offset in self.title_surfaces:
             self.screen.blit(surface, (title_start_x + offset, title_y))
-        
-        for i, option in enumerate(self.options):
-            color = (self.config.COLORS['text'] if i == self.selected_index 
-                    else self.config.COLORS['inactive_text'])
-            option_text = self.font.render(option, True, color)
-            option_rect = option_text.get_rect(
-                center=(self.config.WINDOW_SIZE[0] // 2, 250 + i * 50))
-            self.screen.blit(option_text, option_rect)
-        
-        pygame.display.flip()
 
-    def handle_input(self) -> int:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return 1
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_UP:
-                    self.selected_index = (self.selected_index - 1) % len(self.options)
-                elif event.key == pygame.K_DOWN:
-                    self.selected_index = (self.selected_index + 1) % len(self.options)
-                elif event.key == pygame.K_RETURN:
-                    return self.selected_index
-                elif event.key == pygame.K_ESCAPE:
-                    return 1
-        return -1
+class GameOver(OptionMenu):
+    options = ["Play Again", "Main Menu", "Quit"]
+    options_y = 280
+    escape_choice = 1
+    quit_choice = 2
 
-class GameOver:
-    def __init__(self, screen, font, config, final_score):
-        self.screen = screen
-        self.font = font
-        self.config = config
+    def __init__(self, screen, font, config, final_score, display=None):
+        super().__init__(screen, font, config, display)
         self.final_score = final_score
-        self.options = ["Play Again", "Main Menu", "Quit"]
-        self.selected_index = 0
         self.title_font = pygame.font.Font(None, 72)
+        self.game_over_text = self.title_font.render("Game Over", True, (255, 0, 0))
+        self.score_text = self.font.render(f"Final Score: {self.final_score}", True, 
+                                         self.config.COLORS['text'])
 
-    def draw(self):
-        self.screen.fill(self.config.COLORS['background'])
-        
-        game_over_text = self.title_font.render("Game Over", True, (255, 0, 0))
-        game_over_rect = game_over_text.get_rect(
+    def draw_title(self):
+        game_over_rect = self.game_over_text.get_rect(
             center=(self.config.WINDOW_SIZE[0] // 2, 100))
-        self.screen.blit(game_over_text, game_over_rect)
+        self.screen.blit(self.game_over_text, game_over_rect)
         
-        score_text = self.font.render(f"Final Score: {self.final_score}", True, 
-                                    self.config.COLORS['text'])
-        score_rect = score_text.get_rect(center=(self.config.WINDOW_SIZE[0] // 2, 180))
-        self.screen.blit(score_text, score_rect)
+        score_rect = self.score_text.get_rect(center=(self.config.WINDOW_SIZE[0] // 2, 180))
+        self.screen.blit(self.score_text, score_rect)
 
-        for i, option in enumerate(self.options):
-            color = (self.config.COLORS['text'] if i == self.selected_index 
-                    else self.config.COLORS['inactive_text'])
-            option_text = self.font.render(option, True, color)
-            option_rect = option_text.get_rect(
-                center=(self.config.WINDOW_SIZE[0] // 2, 280 + i * 50))
-            self.screen.blit(option_text, option_rect)
+class PauseMenu(OptionMenu):
+    options = ["Return to Game", "Back to Menu", "Quit"]
+    options_y = 200
+    escape_choice = 0
+    quit_choice = 2
 
-        pygame.display.flip()
+    def __init__(self, screen, font, config, display=None):
+        super().__init__(screen, font, config, display)
+        self.pause_text = self.font.render("Paused", True, self.config.COLORS['text'])
 
-    def handle_input(self) -> int:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return 2
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_UP:
-                    self.selected_index = (self.selected_index - 1) % len(self.options)
-                elif event.key == pygame.K_DOWN:
-                    self.selected_index = (self.selected_index + 1) % len(self.options)
-                elif event.key == pygame.K_RETURN:
-                    return self.selected_index
-                elif event.key == pygame.K_ESCAPE:
-                    return 1
-        return -1
-
-class PauseMenu:
-    def __init__(self, screen, font, config):
-        self.screen = screen
-        self.font = font
-        self.config = config
-        self.options = ["Return to Game", "Back to Menu", "Quit"]
-        self.selected_index = 0
-
-    def draw(self):
-        self.screen.fill(self.config.COLORS['background'])
-        pause_text = self.font.render("Paused", True, self.config.COLORS['text'])
-        pause_rect = pause_text.get_rect(
+    def draw_title(self):
+        pause_rect = self.pause_text.get_rect(
             center=(self.config.WINDOW_SIZE[0] // 2, 100))
-        self.screen.blit(pause_text, pause_rect)
+        self.screen.blit(self.pause_text, pause_rect)
 
-        for i, option in enumerate(self.options):
-            color = (self.config.COLORS['text'] if i == self.selected_index 
-                    else self.config.COLORS['inactive_text'])
-            option_text = self.font.render(option, True, color)
-            option_rect = option_text.get_rect(
-                center=(self.config.WINDOW_SIZE[0] // 2, 200 + i * 50))
-            self.screen.blit(option_text, option_rect)
-
-        pygame.display.flip()
-
-    def handle_input(self) -> int:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                return 2
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_UP:
-                    self.selected_index = (self.selected_index - 1) % len(self.options)
-                elif event.key == pygame.K_DOWN:
-                    self.selected_index = (self.selected_index + 1) % len(self.options)
-                elif event.key == pygame.K_RETURN:
-                    return self.selected_index
-                elif event.key == pygame.K_ESCAPE:
-                    return 0
-        return -1
+def parse_args(argv: List[str] = None) -> GameConfig:
+    parser = argparse.ArgumentParser(description="Giu - Flappy Bird")
+    parser.add_argument('--dirty-rects', action='store_true',
+                        help="only redraw and push the screen regions that changed")
+    parser.add_argument('--record-replays', metavar='DIR',
+                        help="save a replay of every finished game into DIR")
+    parser.add_argument('--render-fps', type=int,
+                        help="frames drawn per second, the simulation always runs at 60; "
+                             "0 is uncapped (default: 60, or 0 with --vsync)")
+    parser.add_argument('--vsync', action='store_true',
+                        help="sync frames to the display refresh rate; the scaled window "
+                             "modes cannot, they render at up to 60 fps instead")
+    parser.add_argument('--low-latency-input', action='store_true',
+                        help="read the keyboard right before each simulation step, "
+                             "uses a little more CPU")
+    parser.add_argument('--scale-to-window', action='store_true',
+                        help="draw at 800x600 and scale the result to the window, "
+                             "keeps drawing cost flat on large displays")
+    parser.add_argument('--resizable', action='store_true',
+                        help="resizable window (implies --scale-to-window)")
+    parser.add_argument('--fullscreen', action='store_true',
+                        help="start in fullscreen, F11 toggles (implies --scale-to-window)")
+    parser.add_argument('--validate-gaps', action='store_true',
+                        help="reroll pipe gaps that no flap sequence could get through")
+    parser.add_argument('--capture', metavar='PATH',
+                        help="stream gameplay frames to PATH: raw 32 bit frames, or YUV "
+                             "if it ends in .y4m; '-' writes to stdout for an encoder")
+    parser.add_argument('--race', metavar='PATH',
+                        help="race the recorded runs in PATH (a replay or a directory of "
+                             "them) as ghosts, on the seed most of them share")
+    parser.add_argument('--ghosts', type=int, default=200, metavar='N',
+                        help="race at most the N best runs (default: %(default)s)")
+    parser.add_argument('--quality', choices=('auto',) + QUALITY_NAMES, default='auto',
+                        help="cosmetic detail; auto lowers it while frames run over "
+                             "budget and raises it again with headroom (default: %(default)s)")
+    parser.add_argument('--no-history', action='store_true',
+                        help="do not log finished runs to the local run history")
+    parser.add_argument('--report-startup', action='store_true',
+                        help="print how long startup took up to the first frame")
+    parser.add_argument('--profile', action='store_true',
+                        help="time each phase of every frame")
+    parser.add_argument('--profile-overlay', action='store_true',
+                        help="show frame time percentiles on screen (implies --profile)")
+    parser.add_argument('--profile-export', metavar='PATH',
+                        help="write frame timings to PATH (.csv or .json) on exit "
+                             "(implies --profile)")
+    args = parser.parse_args(argv)
+    return GameConfig(
+        DIRTY_RECTS=args.dirty_rects,
+        REPLAY_DIR=args.record_replays,
+        PROFILE=args.profile or args.profile_overlay or bool(args.profile_export),
+        PROFILE_OVERLAY=args.profile_overlay,
+        PROFILE_EXPORT=args.profile_export,
+        REPORT_STARTUP=args.report_startup,
+        RECORD_HISTORY=not args.no_history,
+        VALIDATE_GAPS=args.validate_gaps,
+        CAPTURE=args.capture,
+        RACE=args.race,
+        MAX_GHOSTS=args.ghosts,
+        QUALITY=args.quality,
+        RENDER_FPS=args.render_fps if args.render_fps is not None else 0 if args.vsync else 60,
+        VSYNC=args.vsync,
+        LOW_LATENCY_INPUT=args.low_latency_input,
+        SCALE_TO_WINDOW=args.scale_to_window or args.resizable or args.fullscreen,
+        RESIZABLE=args.resizable,
+        FULLSCREEN=args.fullscreen,
+    )
 
 if __name__ == "__main__":
     try:
-        game = FlappyBird()
+        game = FlappyBird(parse_args())
         game.run()
     except Exception as e:
         import traceback
         error_msg = f"An error occurred:\n{str(e)}\n\n{traceback.format_exc()}"
-        print(error_msg)
+        print(error_msg, file=sys.stderr)
         try:
             import ctypes
             ctypes.windll.user32.MessageBoxW(0, error_msg, "Error", 0)
@@ -0,0 +1,98 @@
+# by Giu
+# https://github.com/o-giu
+
+from collections import Counter
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+import giu_flappybird_sim as sim
+from giu_flappybird_replay import Replay, load_replays
+from giu_flappybird_sim import GameConfig
+
+class GhostPack:
+    """Birds of recorded runs, replayed from their flap timelines in one batch.
+
+    A ghost only needs its flaps to fly: pipes never move a bird, and the
+    replay already says on which frame the run ended. So ``step`` applies
+    ``Bird.update`` to every ghost at once with NumPy arrays, with the same
+    float arithmetic, and a ghost is shown up to and including its last
+    frame. The flap timelines are concatenated into one array with a read
+    position per ghost, so finding who flaps this frame is one comparison.
+    """
+
+    def __init__(self, replays: List[Replay], config: Optional[GameConfig] = None):
+        self.config = config or GameConfig()
+        self.replays = replays
+        self.count = len(replays)
+
+        # Physics constants come from the scalar class they mirror
+        bird = sim.Bird(self.config)
+        self.x = bird.x
+        self.start_y = bird.y
+        self.gravity = bird.gravity
+        self.flap_strength = bird.flap_strength
+
+        lengths = np.array([len(replay.flap_frames) for replay in replays], dtype=np.int64)
+        self.flap_end = np.cumsum(lengths)
+        self.flap_start = self.flap_end - lengths
+        # A trailing sentinel keeps the read position of the last ghost in bounds
+        self.flaps = np.concatenate([np.asarray(replay.flap_frames, dtype=np.int64)
+                                     for replay in replays] + [np.array([-1])])
+        self.end_frame = np.array([replay.frames for replay in replays], dtype=np.int64)
+
+        n = self.count
+        self.y = np.empty(n)
+        self.prev_y = np.empty(n)
+        self.velocity = np.empty(n)
+        self.next_flap = np.empty(n, dtype=np.int64)
+        self.visible = np.empty(n, dtype=bool)
+        self.reset()
+
+    def reset(self):
+        self.frame = 0
+        self.y.fill(self.start_y)
+        self.prev_y.fill(self.start_y)
+        self.velocity.fill(0)
+        self.next_flap[:] = self.flap_start
+        self.visible.fill(True)
+
+    def step(self):
+        """Advances every ghost one frame, like ``Simulation.step`` with its recorded flap."""
+        flapping = (self.next_flap < self.flap_end) & (self.flaps[self.next_flap] == self.frame)
+        self.next_flap += flapping
+        self.velocity[flapping] = self.flap_strength
+
+        self.frame += 1
+        self.prev_y[:] = self.y
+        self.velocity += self.gravity
+        self.y += self.velocity
+        np.greater_equal(self.end_frame, self.frame, out=self.visible)
+
+    @property
+    def angles(self) -> np.ndarray:
+        return np.clip(self.velocity * 3, -30, 90)
+
+def load_race(path, config: Optional[GameConfig] = None,
+              max_ghosts: int = 200) -> Tuple[Optional[int], List[Replay]]:
+    """Picks the seed to race and up to ``max_ghosts`` replays of it, best first.
+
+    Ghosts only make sense on their own pipe layout, so the seed with the
+    most replays wins (the higher best score breaks ties). Replays recorded
+    with a different ``VALIDATE_GAPS`` setting have a different layout and
+    are skipped. Returns ``(None, [])`` if nothing can be raced.
+    """
+    config = config or GameConfig()
+    replays = [replay for _, replay in load_replays([path])
+               if replay.validated_gaps == config.VALIDATE_GAPS]
+    if not replays:
+        return None, []
+
+    runs = Counter(replay.seed for replay in replays)
+    best = {}
+    for replay in replays:
+        best[replay.seed] = max(best.get(replay.seed, 0), replay.score)
+    seed = max(runs, key=lambda seed: (runs[seed], best[seed]))
+    ghosts = sorted((replay for replay in replays if replay.seed == seed),
+                    key=lambda replay: -replay.score)
+    return seed, ghosts[:max_ghosts]
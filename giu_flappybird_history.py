@@ -0,0 +1,307 @@
+# by Giu
+# https://github.com/o-giu
+
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from giu_flappybird_sim import GameConfig
+
+# runs file:  16 byte header, then fixed-size records so any run is one seek away
+#   record    timestamp (f64), score (u32), frames (u32), seed (u64), HMAC-SHA256[:16]
+#             the MAC covers the record index too, so records cannot be reordered
+# index file: JSON summary (count, top runs, score histogram, per-day bests) with its own MAC
+FILE_MAGIC = b'GFBH\x01' + bytes(11)
+RECORD = struct.Struct('<dIIQ')
+MAC_SIZE = 16
+RECORD_SIZE = RECORD.size + MAC_SIZE
+INDEX_SAVE_EVERY = 64  # Appends between index rewrites, the tail is re-read on open
+
+class HistoryError(ValueError):
+    pass
+
+class Run(NamedTuple):
+    timestamp: float
+    score: int
+    frames: int
+    seed: int
+
+    @property
+    def day(self) -> str:
+        return time.strftime('%Y-%m-%d', time.localtime(self.timestamp))
+
+class RunHistory:
+    """Append-only log of every run with a maintained summary index.
+
+    Records have a fixed size and carry a truncated HMAC, so a single run
+    is verified without reading the rest of the file. The index keeps the
+    top ``top_size`` runs, a score histogram (for percentiles) and the best
+    run of each day. It is saved every ``INDEX_SAVE_EVERY`` appends and on
+    ``close``, and runs appended after the last save are folded in on open.
+    Nothing is read until the first call, so constructing one is free, and
+    only ``append`` creates the files: queries on a missing history see an
+    empty one.
+    """
+
+    def __init__(self, save_dir='save', top_size: int = 100):
+        save_dir = Path(save_dir)
+        self.save_dir = save_dir
+        self.runs_file = save_dir / 'flappy_bird_runs.dat'
+        self.index_file = save_dir / 'flappy_bird_runs.idx'
+        self.key_file = save_dir / 'flappy_bird_runs.key'
+        self.top_size = top_size
+        self._lock = threading.RLock()
+        self._file = None
+        self._key = None
+        self._index = None
+        self._unsaved = 0
+
+    # Storage
+
+    @property
+    def exists(self) -> bool:
+        return self._file is not None or self.runs_file.exists()
+
+    def _open(self, create: bool = False) -> bool:
+        """Opens the log, False if there is none and ``create`` is off."""
+        if self._file is not None:
+            return True
+        if not create and not self.runs_file.exists():
+            return False
+        if create:
+            self.save_dir.mkdir(parents=True, exist_ok=True)
+        if self.key_file.exists():
+            self._key = self.key_file.read_bytes()
+        elif create:
+            self._key = os.urandom(32)
+            self.key_file.write_bytes(self._key)
+        else:
+            raise HistoryError(f"{self.key_file} is missing, the runs cannot be verified")
+
+        self._file = open(self.runs_file, 'a+b')
+        self._file.seek(0, os.SEEK_END)
+        size = self._file.tell()
+        if size == 0:
+            self._file.write(FILE_MAGIC)
+            self._file.flush()
+            size = len(FILE_MAGIC)
+        else:
+            self._file.seek(0)
+            if self._file.read(len(FILE_MAGIC)) != FILE_MAGIC:
+                raise HistoryError(f"{self.runs_file} is not a run history file")
+        torn = (size - len(FILE_MAGIC)) % RECORD_SIZE
+        if torn:
+            # A crash mid-append left a partial record, drop it
+            self._file.truncate(size - torn)
+        self._count = (size - torn - len(FILE_MAGIC)) // RECORD_SIZE
+        self._last_timestamp = self._read(self._count - 1).timestamp if self._count else 0.0
+        self._load_index()
+        return True
+
+    def _mac(self, index: int, payload: bytes) -> bytes:
+        return hmac.new(self._key, struct.pack('<Q', index) + payload,
+                        hashlib.sha256).digest()[:MAC_SIZE]
+
+    def _read(self, index: int) -> Run:
+        self._file.seek(len(FILE_MAGIC) + index * RECORD_SIZE)
+        data = self._file.read(RECORD_SIZE)
+        payload, mac = data[:RECORD.size], data[RECORD.size:]
+        if len(data) != RECORD_SIZE or not hmac.compare_digest(mac, self._mac(index, payload)):
+            raise HistoryError(f"run {index} failed verification")
+        return Run(*RECORD.unpack(payload))
+
+    # Index
+
+    def _empty_index(self) -> Dict:
+        return {'count': 0, 'top': [], 'histogram': {}, 'days': {}}
+
+    def _index_mac(self, index: Dict) -> str:
+        body = json.dumps(index, sort_keys=True).encode()
+        return hmac.new(self._key, body, hashlib.sha256).hexdigest()
+
+    def _load_index(self):
+        index = None
+        try:
+            stored = json.loads(self.index_file.read_text())
+            if hmac.compare_digest(stored['mac'], self._index_mac(stored['index'])):
+                index = stored['index']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        if index is None or index['count'] > self._count:
+            index = self._empty_index()
+        self._index = index
+        for i in range(index['count'], self._count):
+            self._add_to_index(i, self._read(i))
+        if self._unsaved:
+            self._save_index()
+
+    def _add_to_index(self, i: int, run: Run):
+        index = self._index
+        index['count'] = i + 1
+
+        top = index['top']
+        if len(top) < self.top_size or run.score > top[-1][0]:
+            top.append([run.score, i])
+            top.sort(key=lambda entry: (-entry[0], entry[1]))
+            del top[self.top_size:]
+
+        key = str(run.score)
+        index['histogram'][key] = index['histogram'].get(key, 0) + 1
+
+        day = index['days'].get(run.day)
+        if day is None:
+            index['days'][run.day] = [1, run.score, i]
+        else:
+            day[0] += 1
+            if run.score > day[1]:
+                day[1], day[2] = run.score, i
+        self._unsaved += 1
+
+    def _save_index(self):
+        data = json.dumps({'index': self._index, 'mac': self._index_mac(self._index)})
+        temp_path = self.index_file.with_name(self.index_file.name + '.tmp')
+        temp_path.write_text(data)
+        os.replace(temp_path, self.index_file)
+        self._unsaved = 0
+
+    # Public API
+
+    def append(self, run: Run) -> int:
+        """Stores a run durably and returns its index."""
+        with self._lock:
+            self._open(create=True)
+            i = self._count
+            # Keep timestamps ordered so time range queries can bisect
+            run = run._replace(timestamp=max(run.timestamp, self._last_timestamp))
+            payload = RECORD.pack(*run)
+            self._file.seek(0, os.SEEK_END)
+            self._file.write(payload + self._mac(i, payload))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._count += 1
+            self._last_timestamp = run.timestamp
+            self._add_to_index(i, run)
+            if self._unsaved >= INDEX_SAVE_EVERY:
+                self._save_index()
+            return i
+
+    def close(self):
+        with self._lock:
+            if self._file is None:
+                return
+            if self._unsaved:
+                self._save_index()
+            self._file.close()
+            self._file = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count if self._open() else 0
+
+    def get(self, i: int) -> Run:
+        with self._lock:
+            if not self._open() or not 0 <= i < self._count:
+                raise IndexError("run index out of range")
+            return self._read(i)
+
+    def top(self, n: int = 10) -> List[Run]:
+        with self._lock:
+            if not self._open():
+                return []
+            return [self._read(i) for _, i in self._index['top'][:n]]
+
+    def best_of_day(self, day: str = None) -> Optional[Run]:
+        """Best run of a ``YYYY-MM-DD`` local day, today by default."""
+        with self._lock:
+            if not self._open():
+                return None
+            entry = self._index['days'].get(day or time.strftime('%Y-%m-%d'))
+            return self._read(entry[2]) if entry else None
+
+    def runs_per_day(self) -> Dict[str, int]:
+        with self._lock:
+            if not self._open():
+                return {}
+            return {day: entry[0] for day, entry in self._index['days'].items()}
+
+    def percentile_rank(self, score: int) -> float:
+        """Percentage of runs that scored ``score`` or less."""
+        with self._lock:
+            if not self._open() or not self._count:
+                return 0.0
+            at_or_below = sum(count for value, count in self._index['histogram'].items()
+                              if int(value) <= score)
+            return 100.0 * at_or_below / self._count
+
+    def score_at_percentile(self, q: float) -> int:
+        """Lowest score that at least ``q`` percent of runs are at or below."""
+        with self._lock:
+            if not self._open() or not self._count:
+                return 0
+            needed = q / 100 * self._count
+            seen = 0
+            for value, count in sorted((int(v), c) for v, c in self._index['histogram'].items()):
+                seen += count
+                if seen >= needed:
+                    return value
+            return value
+
+    def runs_between(self, start: float, end: float) -> List[Run]:
+        """Runs with ``start <= timestamp < end``, found by bisecting the log."""
+        with self._lock:
+            if not self._open():
+                return []
+            def first_at_or_after(timestamp: float) -> int:
+                low, high = 0, self._count
+                while low < high:
+                    middle = (low + high) // 2
+                    if self._read(middle).timestamp < timestamp:
+                        low = middle + 1
+                    else:
+                        high = middle
+                return low
+            return [self._read(i) for i in range(first_at_or_after(start),
+                                                 first_at_or_after(end))]
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Query the Giu - Flappy Bird run history")
+    parser.add_argument('--save-dir', default='save',
+                        help="directory holding the history (default: %(default)s)")
+    parser.add_argument('--top', type=int, default=10, help="show the N best runs")
+    parser.add_argument('--day', help="show the best run of YYYY-MM-DD (default: today)")
+    parser.add_argument('--percentile', type=int, metavar='SCORE',
+                        help="show the percentile rank of SCORE")
+    args = parser.parse_args(argv)
+
+    history = RunHistory(args.save_dir)
+    if not history.exists:
+        print(f"No run history in {args.save_dir}")
+        return 0
+    try:
+        print(f"{len(history)} runs")
+        for place, run in enumerate(history.top(args.top), 1):
+            print(f"{place:3}. {run.score:5}  {run.frames / GameConfig().FPS:7.1f}s  "
+                  f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(run.timestamp))}  "
+                  f"seed {run.seed:x}")
+        best = history.best_of_day(args.day)
+        print(f"Best of {args.day or 'today'}: {best.score if best else 'no runs'}")
+        if args.percentile is not None:
+            print(f"Score {args.percentile} is at or above "
+                  f"{history.percentile_rank(args.percentile):.1f}% of runs")
+    except HistoryError as e:
+        print(f"Error: {e}")
+        return 1
+    finally:
+        history.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
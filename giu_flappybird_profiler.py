@@ -0,0 +1,120 @@
+# by Giu
+# https://github.com/o-giu
+
+import csv
+import gc
+import json
+from array import array
+from pathlib import Path
+from time import perf_counter
+from typing import Dict, List
+
+# Phase indexes, passed as ints so recording a sample is a list index
+PHASE_INPUT = 0
+PHASE_UPDATE = 1
+PHASE_DRAW = 2       # Includes the bird, pipe and ghost sub-phases
+PHASE_BIRD_DRAW = 3
+PHASE_PIPE_DRAW = 4
+PHASE_FLIP = 5
+PHASE_TICK = 6
+PHASE_SAVE = 7       # High score and replay writes at game over
+PHASE_GC = 8         # Time the garbage collector ran during the frame
+PHASE_GHOST_DRAW = 9  # Race mode ghosts, part of draw
+PHASE_NAMES = ('input', 'update', 'draw', 'bird_draw', 'pipe_draw',
+               'flip', 'tick', 'save', 'gc', 'ghost_draw')
+
+class FrameProfiler:
+    """Per-phase frame timings kept in fixed-size ``array('d')`` ring buffers.
+
+    A frame is ``start_frame``, then ``lap(phase)`` after each phase (the time
+    since the previous lap), then ``end_frame``. Nested work is recorded with
+    ``add``. Nothing is allocated per frame, and when profiling is off the
+    game keeps no profiler at all, so the cost is one ``None`` check per phase.
+    """
+
+    def __init__(self, capacity: int = 3600):
+        self.capacity = capacity
+        self.phases = [array('d', bytes(8 * capacity)) for _ in PHASE_NAMES]
+        self.totals = array('d', bytes(8 * capacity))
+        self.frames = 0
+        self.current = [0.0] * len(PHASE_NAMES)
+        self._frame_start = self._mark = perf_counter()
+        self._gc_start = 0.0
+        gc.callbacks.append(self._on_gc)
+
+    def _on_gc(self, phase: str, info: dict):
+        if phase == 'start':
+            self._gc_start = perf_counter()
+        else:
+            self.current[PHASE_GC] += perf_counter() - self._gc_start
+
+    def close(self):
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+
+    def start_frame(self):
+        current = self.current
+        for i in range(len(current)):
+            current[i] = 0.0
+        self._frame_start = self._mark = perf_counter()
+
+    def lap(self, phase: int):
+        now = perf_counter()
+        self.current[phase] += now - self._mark
+        self._mark = now
+
+    def add(self, phase: int, seconds: float):
+        self.current[phase] += seconds
+
+    def end_frame(self):
+        slot = self.frames % self.capacity
+        for samples, value in zip(self.phases, self.current):
+            samples[slot] = value
+        self.totals[slot] = perf_counter() - self._frame_start
+        self.frames += 1
+
+    def _ordered(self, samples: array) -> List[float]:
+        # Oldest to newest
+        if self.frames <= self.capacity:
+            return samples[:self.frames].tolist()
+        slot = self.frames % self.capacity
+        return samples[slot:].tolist() + samples[:slot].tolist()
+
+    @property
+    def last_frame(self) -> float:
+        return self.totals[(self.frames - 1) % self.capacity] if self.frames else 0.0
+
+    def percentiles(self, *quantiles: float, phase: int = None) -> List[float]:
+        """Frame time (or one phase's time) percentiles over the buffered frames, in seconds."""
+        samples = self.totals if phase is None else self.phases[phase]
+        values = sorted(self._ordered(samples))
+        if not values:
+            return [0.0 for _ in quantiles]
+        return [values[min(len(values) - 1, int(q / 100 * len(values)))] for q in quantiles]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        summary = {}
+        for name, phase in [('frame', None)] + [(n, i) for i, n in enumerate(PHASE_NAMES)]:
+            p50, p99, worst = self.percentiles(50, 99, 100, phase=phase)
+            summary[name] = {'p50_ms': p50 * 1000, 'p99_ms': p99 * 1000, 'max_ms': worst * 1000}
+        return summary
+
+    def export(self, path):
+        """Writes the buffered frames as CSV, or JSON when the path ends in .json."""
+        path = Path(path)
+        first = max(0, self.frames - self.capacity)
+        columns = [self._ordered(self.totals)] + [self._ordered(p) for p in self.phases]
+        rows = zip(range(first, self.frames), *columns)
+        header = ['frame', 'total'] + list(PHASE_NAMES)
+        if path.suffix.lower() == '.json':
+            data = {
+                'unit': 'seconds',
+                'summary': self.summary(),
+                'frames': [dict(zip(header, row)) for row in rows],
+            }
+            path.write_text(json.dumps(data, indent=1))
+        else:
+            with path.open('w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows(rows)
@@ -0,0 +1,74 @@
+# by Giu
+# https://github.com/o-giu
+
+# Quality levels, each one drops more cosmetic work than the one above
+QUALITY_LOW = 0      # Also draws the bird unrotated
+QUALITY_MEDIUM = 1   # No pipe shine, single surface menu title
+QUALITY_HIGH = 2     # Everything
+QUALITY_NAMES = ('low', 'medium', 'high')
+
+class QualityGovernor:
+    """Steps cosmetic detail down when frames run over budget, and back up.
+
+    ``sample`` takes the time a frame spent working (not waiting for the
+    clock or the display). Samples are averaged over windows of ``window``
+    frames, so one slow frame changes nothing. A window over ``DOWN_LOAD``
+    of the budget steps down at once, stepping up needs ``raise_after``
+    windows in a row under ``UP_LOAD``. The gap between the two loads and
+    the hold time keep the level from flickering. Every step down doubles
+    the hold time (up to ``MAX_RAISE_AFTER``), so a machine that only just
+    copes with a level stops retrying it every few seconds.
+
+    With ``adaptive=False`` the level stays where it was set.
+    """
+
+    DOWN_LOAD = 0.9
+    UP_LOAD = 0.6
+    RAISE_AFTER = 6        # Windows, 3 seconds at 60 fps
+    MAX_RAISE_AFTER = 64
+
+    def __init__(self, budget: float, level: int = QUALITY_HIGH,
+                 adaptive: bool = True, window: int = 30):
+        self.budget = budget
+        self.level = level
+        self.adaptive = adaptive
+        self.window = window
+        self.raise_after = self.RAISE_AFTER
+        self.changes = 0
+        self.restart()
+
+    def restart(self):
+        """Drops the current window, for frames that do not reflect gameplay cost."""
+        self.window_time = 0.0
+        self.window_frames = 0
+        self.calm_windows = 0
+
+    def sample(self, seconds: float) -> bool:
+        """Records one frame's work time. True if the level changed."""
+        if not self.adaptive:
+            return False
+        self.window_time += seconds
+        self.window_frames += 1
+        if self.window_frames < self.window:
+            return False
+
+        load = self.window_time / self.window_frames / self.budget
+        self.window_time = 0.0
+        self.window_frames = 0
+        if load > self.DOWN_LOAD:
+            self.calm_windows = 0
+            if self.level > QUALITY_LOW:
+                self.level -= 1
+                self.raise_after = min(self.raise_after * 2, self.MAX_RAISE_AFTER)
+                self.changes += 1
+                return True
+        elif load < self.UP_LOAD:
+            self.calm_windows += 1
+            if self.calm_windows >= self.raise_after and self.level < QUALITY_HIGH:
+                self.level += 1
+                self.calm_windows = 0
+                self.changes += 1
+                return True
+        else:
+            self.calm_windows = 0
+        return False
@@ -0,0 +1,194 @@
+# by Giu
+# https://github.com/o-giu
+
+import argparse
+import struct
+import sys
+import time
+import zlib
+from array import array
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from giu_flappybird_sim import GameConfig, Simulation
+
+# File layout (little endian):
+#   header  magic, version, flags, seed, frames, score, flap count
+#   body    flap frames as LEB128 varints, each stored as the delta to the previous one
+#   footer  CRC32 of header and body
+MAGIC = b'GFBR'
+VERSION = 1
+HEADER = struct.Struct('<4sBBQIII')
+FOOTER = struct.Struct('<I')
+FLAG_FINISHED = 1  # The recorded game ended in a crash, not by quitting
+FLAG_VALIDATED_GAPS = 2  # Recorded with GameConfig.VALIDATE_GAPS, which changes the layout
+
+class ReplayError(ValueError):
+    pass
+
+def _encode_varints(values: List[int]) -> bytes:
+    out = bytearray()
+    previous = 0
+    for value in values:
+        delta = value - previous
+        previous = value
+        while delta >= 0x80:
+            out.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return bytes(out)
+
+def _decode_varints(data: bytes, count: int) -> array:
+    values = array('I')
+    previous = shift = delta = 0
+    for byte in data:
+        delta |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            # Five bytes already hold 32 bits, a longer varint is not a frame
+            if shift > 28:
+                raise ReplayError("flap frame out of range")
+            continue
+        previous += delta
+        if previous > 0xFFFFFFFF:
+            raise ReplayError("flap frame out of range")
+        values.append(previous)
+        shift = delta = 0
+    if len(values) != count or shift:
+        raise ReplayError("flap list does not match its header")
+    return values
+
+@dataclass
+class Replay:
+    """A seed plus the frames the player flapped on, enough to rebuild a game."""
+
+    seed: int
+    frames: int
+    score: int
+    flap_frames: array = field(default_factory=lambda: array('I'))
+    finished: bool = True
+    validated_gaps: bool = False
+
+    @classmethod
+    def from_simulation(cls, sim: Simulation) -> 'Replay':
+        return cls(sim.seed, sim.frame, sim.score, array('I', sim.flap_frames), sim.game_over,
+                   sim.config.VALIDATE_GAPS)
+
+    def to_bytes(self) -> bytes:
+        flags = ((FLAG_FINISHED if self.finished else 0) |
+                 (FLAG_VALIDATED_GAPS if self.validated_gaps else 0))
+        data = HEADER.pack(MAGIC, VERSION, flags, self.seed, self.frames, self.score, len(self.flap_frames))
+        data += _encode_varints(self.flap_frames)
+        return data + FOOTER.pack(zlib.crc32(data))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Replay':
+        if len(data) < HEADER.size + FOOTER.size:
+            raise ReplayError("replay is truncated")
+        body, (crc,) = data[:-FOOTER.size], FOOTER.unpack(data[-FOOTER.size:])
+        if zlib.crc32(body) != crc:
+            raise ReplayError("replay checksum mismatch")
+        magic, version, flags, seed, frames, score, flap_count = HEADER.unpack_from(body)
+        if magic != MAGIC:
+            raise ReplayError("not a replay file")
+        if version != VERSION:
+            raise ReplayError(f"unsupported replay version {version}")
+        flap_frames = _decode_varints(body[HEADER.size:], flap_count)
+        # Frames only grow, so checking the last flap covers them all
+        if flap_frames and flap_frames[-1] >= frames:
+            raise ReplayError("flap after the end of the replay")
+        return cls(seed, frames, score, flap_frames, bool(flags & FLAG_FINISHED),
+                   bool(flags & FLAG_VALIDATED_GAPS))
+
+    def save(self, path):
+        Path(path).write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path) -> 'Replay':
+        return cls.from_bytes(Path(path).read_bytes())
+
+def load_replays(paths, on_error: Optional[Callable[[Path, Exception], None]] = None
+                 ) -> Iterator[Tuple[Path, Replay]]:
+    """Yields ``(path, replay)`` for replay files and directories of .gfbr files.
+
+    Unreadable files are skipped, ``on_error(path, error)`` hears about each.
+    """
+    for path in map(Path, paths):
+        for replay_path in (sorted(path.glob('*.gfbr')) if path.is_dir() else [path]):
+            try:
+                replay = Replay.load(replay_path)
+            except (OSError, ReplayError) as e:
+                if on_error:
+                    on_error(replay_path, e)
+                continue
+            yield replay_path, replay
+
+def play(replay: Replay, config: Optional[GameConfig] = None,
+         sim: Optional[Simulation] = None) -> Simulation:
+    """Re-runs a replay headless as fast as possible and returns the final state.
+
+    A ``sim`` whose gap validation does not match the replay's is replaced.
+    """
+    if sim is None or sim.config.VALIDATE_GAPS != replay.validated_gaps:
+        config = config or (sim.config if sim else GameConfig())
+        sim = Simulation(replace(config, VALIDATE_GAPS=replay.validated_gaps))
+    sim.reset(replay.seed)
+    flap_frames = replay.flap_frames
+    next_flap = 0
+    flap_count = len(flap_frames)
+    step = sim.step
+    while sim.frame < replay.frames:
+        if next_flap < flap_count and flap_frames[next_flap] == sim.frame:
+            next_flap += 1
+            if not step(True):
+                break
+        elif not step():
+            break
+    return sim
+
+def verify(replay: Replay, config: Optional[GameConfig] = None,
+           sim: Optional[Simulation] = None) -> bool:
+    """True if replaying reproduces the claimed score, length and ending."""
+    sim = play(replay, config, sim)
+    return (sim.score == replay.score and sim.frame == replay.frames and
+            sim.game_over == replay.finished)
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Verify Giu - Flappy Bird replays")
+    parser.add_argument('replays', nargs='+', type=Path,
+                        help="replay files or directories of .gfbr files")
+    args = parser.parse_args(argv)
+
+    config = GameConfig()
+    sims = {}  # One per gap validation setting
+    checked = failures = 0
+    total_frames = 0
+    def unreadable(path: Path, error: Exception):
+        nonlocal checked, failures
+        print(f"{path}: unreadable ({error})")
+        checked += 1
+        failures += 1
+
+    start = time.perf_counter()
+    for path, replay in load_replays(args.replays, unreadable):
+        checked += 1
+        sim = sims.get(replay.validated_gaps)
+        if sim is None:
+            sim = sims[replay.validated_gaps] = Simulation(
+                replace(config, VALIDATE_GAPS=replay.validated_gaps))
+        ok = verify(replay, config, sim)
+        total_frames += sim.frame
+        if not ok:
+            failures += 1
+        print(f"{path}: {'OK' if ok else 'FAIL'} claimed {replay.score}, "
+              f"replayed {sim.score} in {sim.frame} frames")
+    elapsed = max(time.perf_counter() - start, 1e-9)
+
+    print(f"{checked - failures}/{checked} verified, {total_frames} frames in "
+          f"{elapsed:.2f}s ({total_frames / elapsed:,.0f} frames/s, "
+          f"{total_frames / config.FPS / elapsed:,.0f}x real time)")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+# by Giu
+# https://github.com/o-giu
+
+import random
+from dataclasses import dataclass
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+@dataclass
+class GameConfig:
+    WINDOW_SIZE: Tuple[int, int] = (800, 600)
+    BIRD_SIZE: Tuple[int, int] = (40, 30)
+    PIPE_WIDTH: int = 80
+    GAP_SIZE: int = 200
+    FPS: int = 60
+    DIRTY_RECTS: bool = False
+    REPLAY_DIR: Optional[str] = None
+    PROFILE: bool = False
+    PROFILE_OVERLAY: bool = False
+    PROFILE_EXPORT: Optional[str] = None
+    REPORT_STARTUP: bool = False
+    RENDER_FPS: int = 60            # Frames drawn per second, 0 = uncapped (use with VSYNC)
+    VSYNC: bool = False
+    LOW_LATENCY_INPUT: bool = False
+    MAX_STEPS_PER_FRAME: int = 5    # Simulation catch-up limit after a stall
+    SCALE_TO_WINDOW: bool = False   # Draw at WINDOW_SIZE, then scale to the real window
+    RESIZABLE: bool = False
+    FULLSCREEN: bool = False
+    RECORD_HISTORY: bool = True
+    VALIDATE_GAPS: bool = False     # Reroll gaps no flap sequence could get through
+    CAPTURE: Optional[str] = None   # Raw or .y4m video of the gameplay frames
+    RACE: Optional[str] = None      # Replay file or directory to race as ghosts
+    MAX_GHOSTS: int = 200
+    QUALITY: str = 'auto'           # 'auto' (frame time governed), 'low', 'medium' or 'high'
+    COLORS: dict = None
+
+    def __post_init__(self):
+        self.COLORS = {
+            'background': (135, 206, 235),  # Sky blue
+            'bird': (255, 255, 0),         # Yellow
+            'pipe': (34, 139, 34),         # Forest green
+            'text': (255, 255, 255),       # White
+            'inactive_text': (128, 128, 128),  # Gray
+            'ground': (139, 69, 19)        # Brown
+        }
+
+def rect_coord(value: float) -> int:
+    # pygame.Rect rounds float coordinates half away from zero on assignment
+    if value >= 0:
+        return int(value + 0.5)
+    return -int(-value + 0.5)
+
+class Observation(NamedTuple):
+    """What an autopilot policy sees each frame: the bird and the next pipe ahead."""
+    bird_y: float
+    velocity: float
+    pipe_x: float
+    gap_y: int
+    gap_size: float
+    speed: float
+
+class Bird:
+    def __init__(self, config: GameConfig):
+        self.config = config
+        self.reset()
+
+    def reset(self):
+        self.x = self.config.WINDOW_SIZE[0] // 3
+        self.y = self.config.WINDOW_SIZE[1] // 2
+        self.prev_y = self.y  # Position before the last update, for render interpolation
+        self.velocity = 0
+        self.gravity = 0.5
+        self.flap_strength = -6
+        self.angle = 0
+
+    @property
+    def rect(self) -> Tuple[int, int, int, int]:
+        return (self.x, rect_coord(self.y),
+                self.config.BIRD_SIZE[0], self.config.BIRD_SIZE[1])
+
+    def flap(self):
+        self.velocity = self.flap_strength
+
+    def update(self):
+        self.prev_y = self.y
+        self.velocity += self.gravity
+        self.y += self.velocity
+        self.angle = max(-30, min(self.velocity * 3, 90))
+
+class Pipe:
+    # Slotted so pooled records carry no per-instance __dict__
+    __slots__ = ('config', 'x', 'prev_x', 'base_speed', 'speed', 'passed',
+                 'gap_y', 'gap_size', 'top_height', 'bottom_y')
+
+    def __init__(self, config: GameConfig, x: int, gap_y: int,
+                 gap_size: Optional[float] = None):
+        self.config = config
+        self.base_speed = 3
+        self.reset(x, gap_y, gap_size)
+
+    def reset(self, x: int, gap_y: int, gap_size: Optional[float] = None):
+        """Reinitializes a recycled pipe as if it had just been created."""
+        self.x = x
+        self.prev_x = x  # Position before the last update, for render interpolation
+        self.speed = self.base_speed
+        self.passed = False
+        self.gap_y = gap_y
+        self.gap_size = self.config.GAP_SIZE if gap_size is None else gap_size
+        self.top_height = int(gap_y - self.gap_size // 2)
+        self.bottom_y = int(gap_y + self.gap_size // 2)
+
+    @property
+    def top_rect(self) -> Tuple[int, int, int, int]:
+        return (rect_coord(self.x), 0, self.config.PIPE_WIDTH, self.top_height)
+
+    @property
+    def bottom_rect(self) -> Tuple[int, int, int, int]:
+        return (rect_coord(self.x), self.bottom_y, self.config.PIPE_WIDTH,
+                self.config.WINDOW_SIZE[1] - self.bottom_y)
+
+    def hits(self, left: int, top: int, width: int, height: int) -> bool:
+        """pygame.Rect.colliderect against either pipe rect, without building rects."""
+        x = rect_coord(self.x)
+        if not (x < left + width and x + self.config.PIPE_WIDTH > left):
+            return False
+        window_height = self.config.WINDOW_SIZE[1]
+        return ((self.top_height > 0 and top < self.top_height and top + height > 0) or
+                (self.bottom_y < window_height and top < window_height and
+                 top + height > self.bottom_y))
+
+    def update(self):
+        # Speed is set every frame from the difficulty (handled in Simulation)
+        self.prev_x = self.x
+        self.x -= self.speed
+
+class PipePool:
+    """Fixed-capacity ring buffer of pipe records, oldest first.
+
+    Pipes leave the screen in the order they spawned, so removing one is
+    just moving ``head`` forward and spawning reuses the record behind the
+    newest pipe. In steady state nothing is allocated. The pool only grows
+    (once, by doubling) if more pipes than ``capacity`` are ever on screen.
+    """
+
+    __slots__ = ('config', 'pipe_cls', 'slots', 'capacity', 'head', 'count')
+
+    def __init__(self, config: GameConfig, pipe_cls: Callable[..., Pipe] = Pipe,
+                 capacity: int = 8):
+        self.config = config
+        self.pipe_cls = pipe_cls
+        self.capacity = capacity
+        self.slots = [self._new_record() for _ in range(capacity)]
+        self.head = 0
+        self.count = 0
+
+    def _new_record(self) -> Pipe:
+        return self.pipe_cls(self.config, self.config.WINDOW_SIZE[0], 0)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> Pipe:
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("pipe index out of range")
+        return self.slots[(self.head + index) % self.capacity]
+
+    def __iter__(self):
+        slots, capacity, head = self.slots, self.capacity, self.head
+        for i in range(self.count):
+            yield slots[(head + i) % capacity]
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def spawn(self, x: int, gap_y: int, gap_size: Optional[float] = None) -> Pipe:
+        if self.count == self.capacity:
+            ordered = list(self)
+            self.slots = ordered + [self._new_record() for _ in range(self.capacity)]
+            self.capacity *= 2
+            self.head = 0
+        pipe = self.slots[(self.head + self.count) % self.capacity]
+        pipe.reset(x, gap_y, gap_size)
+        self.count += 1
+        return pipe
+
+    def remove_oldest(self):
+        self.head = (self.head + 1) % self.capacity
+        self.count -= 1
+
+class Simulation:
+    """Headless game state advanced one fixed frame at a time.
+
+    Time is measured in frames (``config.FPS`` per second) instead of wall
+    clock ticks, so a game runs as fast as ``step`` is called and needs no
+    display, window or clock. ``bird_cls`` and ``pipe_cls`` let a renderer
+    plug in subclasses that know how to draw themselves.
+
+    Pipe gaps come from a ``random.Random`` seeded per game, and every flap
+    is logged in ``flap_frames`` by the frame it happened before, so a seed
+    plus that list reproduces a game exactly. With ``VALIDATE_GAPS`` a
+    ``GapValidator`` rerolls, from the same generator, any gap no flap
+    sequence could get through, so validated seeds are just as reproducible.
+    Its ``Solver`` depends on the config alone: one is built on the first
+    reset and reused, or shared between simulations by passing ``solver``.
+    """
+
+    def __init__(self, config: Optional[GameConfig] = None,
+                 seed: Optional[int] = None,
+                 bird_cls: Callable[..., Bird] = Bird,
+                 pipe_cls: Callable[..., Pipe] = Pipe,
+                 solver=None):
+        self.config = config or GameConfig()
+        self.rng = random.Random()
+        self.bird_cls = bird_cls
+        self.pipe_cls = pipe_cls
+        self.pipes = PipePool(self.config, pipe_cls)
+        self.validator = None
+        self.solver = solver  # Built by the first validated reset, shared by the games after it
+        self.reset(seed)
+
+    def reset(self, seed: Optional[int] = None):
+        """Starts a new game, on a fresh random seed unless one is given."""
+        self.seed = seed if seed is not None else random.getrandbits(63)
+        self.rng.seed(self.seed)
+        self.flap_frames: List[int] = []
+        self.bird = self.bird_cls(self.config)
+        self.pipes.clear()
+        self.frame = 0
+        self.score = 0
+        self.game_over = False
+        self.difficulty_factor = 1.0
+        self.gap_size = self.config.GAP_SIZE
+        if self.config.VALIDATE_GAPS:
+            # Imported here, the solver builds on this module
+            from giu_flappybird_solver import GapValidator, Solver
+            if self.solver is None:
+                self.solver = Solver(self.config)
+            self.validator = GapValidator(self, self.solver)
+        self.spawn_pipe()
+
+    @property
+    def elapsed_time(self) -> float:
+        return self.frame / self.config.FPS
+
+    def random_gap_y(self) -> int:
+        return self.rng.randint(200, self.config.WINDOW_SIZE[1] - 200)
+
+    def spawn_pipe(self):
+        gap_y = self.random_gap_y()
+        if self.validator:
+            gap_y = self.validator.choose_gap(gap_y)
+        self.pipes.spawn(self.config.WINDOW_SIZE[0], gap_y, self.gap_size)
+
+    def next_pipe(self) -> Pipe:
+        """The oldest pipe the bird has not passed yet (the newest if all are passed)."""
+        for pipe in self.pipes:
+            if not pipe.passed:
+                return pipe
+        return self.pipes[-1]
+
+    def observe(self) -> Observation:
+        pipe = self.next_pipe()
+        return Observation(self.bird.y, self.bird.velocity, pipe.x, pipe.gap_y,
+                           pipe.gap_size, pipe.speed)
+
+    def flap(self):
+        if self.game_over:
+            return
+        if not self.flap_frames or self.flap_frames[-1] != self.frame:
+            self.flap_frames.append(self.frame)
+        self.bird.flap()
+
+    def step(self, flap: bool = False) -> bool:
+        """Advance one frame, flapping first if asked. Returns False once over."""
+        if self.game_over:
+            return False
+        if flap:
+            self.flap()
+
+        self.frame += 1
+        self.bird.update()
+        self.advance_pipes()
+
+        # Check collisions
+        bird = self.bird
+        if (bird.y < 0 or
+            bird.y + self.config.BIRD_SIZE[1] > self.config.WINDOW_SIZE[1]):
+            self.game_over = True
+
+        pipes = self.pipes
+        slots, capacity = pipes.slots, pipes.capacity
+        bird_top = rect_coord(bird.y)
+        bird_width, bird_height = self.config.BIRD_SIZE
+        for i in range(pipes.count):
+            if slots[(pipes.head + i) % capacity].hits(bird.x, bird_top,
+                                                       bird_width, bird_height):
+                self.game_over = True
+
+        return not self.game_over
+
+    def advance_pipes(self):
+        """The pipe half of ``step``: difficulty, spawning, movement and scoring.
+
+        Pipes never depend on the bird's height, so this alone replays a
+        seed's pipe layout, which is how the survivability solver uses it.
+        """
+        # Update difficulty based on time
+        self.difficulty_factor = min(3.0, 1.0 + self.elapsed_time / 30)
+
+        # Apply difficulty to pipe speed and gap size
+        pipes = self.pipes
+        slots, capacity = pipes.slots, pipes.capacity
+        for i in range(pipes.count):
+            pipe = slots[(pipes.head + i) % capacity]
+            pipe.speed = pipe.base_speed * self.difficulty_factor
+        self.gap_size = max(120, 200 - (self.difficulty_factor - 1) * 100)  # Shrink gap size
+
+        # Spawn new pipes
+        if not pipes.count or pipes[-1].x < self.config.WINDOW_SIZE[0] - 500:
+            self.spawn_pipe()
+            slots, capacity = pipes.slots, pipes.capacity
+
+        # Update pipes
+        pipe_width = self.config.PIPE_WIDTH
+        bird = self.bird
+        for i in range(pipes.count):
+            pipe = slots[(pipes.head + i) % capacity]
+            pipe.update()
+
+            # Score when passing pipes
+            if not pipe.passed and pipe.x + pipe_width < bird.x:
+                pipe.passed = True
+                self.score += 1
+
+        # Remove off-screen pipes
+        while pipes.count and slots[pipes.head].x + pipe_width <= 0:
+            pipes.remove_oldest()
+
+        if self.validator:
+            self.validator.advance()
@@ -0,0 +1,265 @@
+# by Giu
+# https://github.com/o-giu
+
+import argparse
+import sys
+import time
+from functools import reduce
+from operator import or_
+from typing import List, NamedTuple, Optional, Tuple
+
+import giu_flappybird_sim as sim
+from giu_flappybird_sim import GameConfig, Simulation, rect_coord
+
+# The bird's physics keep y on a half pixel grid: y starts whole, gravity is
+# 0.5 and a flap sets the velocity to -6. States are exact, not approximated:
+#   h  bird.y in half pixels (bit h of a Python int)
+#   j  velocity row, bird.velocity == (j - VELOCITY_ZERO) / 2
+# Each velocity row is one int whose set bits are the heights some flap
+# sequence can reach, so a frame is a handful of shifts and ands per row.
+VELOCITY_ZERO = 12
+FLAP_ROW = 1   # A flap sets -6, the same update adds gravity: -5.5
+MAX_REROLLS = 8
+RISES = range(VELOCITY_ZERO - 2, 0, -1)   # Half pixels rows 1 .. VELOCITY_ZERO - 2 rise
+FALLS = range(0, 1 << 16)                # Half pixels the rows from VELOCITY_ZERO - 1 on fall
+
+class SolveResult(NamedTuple):
+    survivable: bool
+    frames: int                    # Frames checked, or the frame no strategy survives
+    flap_frames: Optional[List[int]] = None  # One surviving flap sequence, if asked for
+
+class Solver:
+    """Decides whether any flap sequence survives a pipe layout.
+
+    ``advance`` moves the set of reachable ``(height, velocity)`` states on
+    one frame, given the bird heights that frame allows. Between pipes only
+    the floor and ceiling constrain the bird and the set settles into a
+    fixed point, which is kept as one shared object so free frames after it
+    cost a single identity check.
+    """
+
+    def __init__(self, config: Optional[GameConfig] = None):
+        self.config = config or GameConfig()
+        bird = sim.Bird(self.config)
+        if bird.gravity != 0.5 or bird.flap_strength != -6 or bird.y != int(bird.y):
+            raise ValueError("the solver assumes the default bird physics")
+        self.bird_x = bird.x
+        self.start_height = int(bird.y) * 2
+        self.bird_width, self.bird_height = self.config.BIRD_SIZE
+        self.max_height = 2 * (self.config.WINDOW_SIZE[1] - self.bird_height)
+        self._masks = {}
+        self._game = None  # Reused by solve, reset per seed
+        self.free_range = (0, self.max_height)
+        self.free_rows = self._settle()
+
+    def _mask(self, allowed: Tuple[int, int]) -> int:
+        mask = self._masks.get(allowed)
+        if mask is None:
+            low, high = allowed
+            mask = ((1 << (high - low + 1)) - 1) << low if high >= low else 0
+            self._masks[allowed] = mask
+        return mask
+
+    def start(self) -> List[int]:
+        rows = [0] * (VELOCITY_ZERO + 1)
+        rows[VELOCITY_ZERO] = 1 << self.start_height
+        return rows
+
+    def allowed(self, pipes) -> Tuple[int, int]:
+        """Half pixel heights the bird survives at, given the pipes after this frame's move."""
+        low, high = self.free_range
+        right = self.bird_x + self.bird_width
+        pipe_width = self.config.PIPE_WIDTH
+        for pipe in pipes:
+            x = rect_coord(pipe.x)
+            if x < right and x + pipe_width > self.bird_x:
+                # rect top is rect_coord(y) == (h + 1) // 2 for h >= 0
+                low = max(low, 2 * pipe.top_height - 1)
+                high = min(high, 2 * (pipe.bottom_y - self.bird_height))
+        return low, high
+
+    def advance(self, rows: List[int], allowed: Tuple[int, int]) -> List[int]:
+        """Reachable states one frame later, an empty list once nothing survives."""
+        if rows is self.free_rows and allowed == self.free_range:
+            return rows
+        mask = self._mask(allowed)
+        # Gravity first: row j moves to j + 1 and moves j + 1 - VELOCITY_ZERO
+        # half pixels, rows below VELOCITY_ZERO - 1 still rise. A flap from
+        # any row lands in FLAP_ROW, VELOCITY_ZERO - FLAP_ROW half pixels up.
+        new_rows = [0, (reduce(or_, rows, 0) >> (VELOCITY_ZERO - FLAP_ROW)) & mask]
+        new_rows += [bits >> rise & mask for bits, rise in zip(rows[1:VELOCITY_ZERO - 1], RISES)]
+        new_rows += [bits << fall & mask for bits, fall in zip(rows[VELOCITY_ZERO - 1:], FALLS)]
+        while new_rows and not new_rows[-1]:
+            new_rows.pop()
+        if allowed == self.free_range and new_rows == self.free_rows:
+            return self.free_rows
+        return new_rows
+
+    def _settle(self) -> List[int]:
+        # Free flight from the start position until the state stops changing
+        self.free_rows = None
+        rows = self.start()
+        for _ in range(100 * self.config.FPS):
+            new_rows = self.advance(rows, self.free_range)
+            if new_rows == rows:
+                return new_rows
+            rows = new_rows
+        return None  # Never settled, every frame is computed in full
+
+    def solve(self, seed: int, frames: int, witness: bool = False) -> SolveResult:
+        """Checks the first ``frames`` frames of a seed's pipe layout.
+
+        With ``witness`` every frame's states are kept and one surviving flap
+        sequence is traced back, ready for ``Simulation.step``.
+        """
+        game = self._game
+        if game is None:
+            game = self._game = Simulation(self.config, seed, solver=self)
+        else:
+            game.reset(seed)
+        rows = self.start()
+        history = [rows] if witness else None
+        allowed, advance, advance_pipes = self.allowed, self.advance, game.advance_pipes
+        for frame in range(1, frames + 1):
+            game.frame = frame
+            advance_pipes()
+            rows = advance(rows, allowed(game.pipes))
+            if witness:
+                history.append(rows)
+            if not rows:
+                return SolveResult(False, frame)
+        return SolveResult(True, frames, self._trace(history) if witness else None)
+
+    def _trace(self, history: List[List[int]]) -> List[int]:
+        rows = history[-1]
+        j = next(j for j in range(len(rows)) if rows[j])
+        h = (rows[j] & -rows[j]).bit_length() - 1
+        flap_frames = []
+        for frame in range(len(history) - 1, 0, -1):
+            previous = history[frame - 1]
+            fall = j - VELOCITY_ZERO
+            # Prefer coasting: row j - 1 at h - fall
+            before = h - fall
+            if j > FLAP_ROW and 0 <= before and j - 1 < len(previous) and previous[j - 1] >> before & 1:
+                j, h = j - 1, before
+                continue
+            # Otherwise the bird flapped from any row at h + 11
+            h += VELOCITY_ZERO - FLAP_ROW
+            j = next(row for row in range(len(previous)) if previous[row] >> h & 1)
+            flap_frames.append(frame - 1)
+        flap_frames.reverse()
+        return flap_frames
+
+class GapValidator:
+    """Keeps a ``Simulation``'s layout survivable, one spawned pipe at a time.
+
+    The validator follows every state any flap sequence could be in (not
+    the player's bird, so the layout depends on the seed alone). A new gap
+    is accepted if those states survive until the new pipe is behind the
+    bird; pipes spawn 500 pixels apart, so no later pipe can reach the bird
+    before then. Otherwise the gap is rerolled up to ``MAX_REROLLS`` times,
+    keeping the candidate that survives longest if none makes it.
+    """
+
+    def __init__(self, game: Simulation, solver: Optional[Solver] = None):
+        self.game = game
+        self.solver = solver or Solver(game.config)
+        self.rows = self.solver.start()
+
+    def advance(self):
+        """Called by the simulation once its pipes have moved for the frame."""
+        self.rows = self.solver.advance(self.rows, self.solver.allowed(self.game.pipes))
+
+    def choose_gap(self, gap_y: int) -> int:
+        best_gap_y, best_frame = gap_y, -1
+        for attempt in range(MAX_REROLLS + 1):
+            if attempt:
+                gap_y = self.game.random_gap_y()
+            dead_frame = self._project(gap_y)
+            if dead_frame is None:
+                return gap_y
+            if dead_frame > best_frame:
+                best_gap_y, best_frame = gap_y, dead_frame
+        return best_gap_y
+
+    def _project(self, gap_y: int) -> Optional[int]:
+        # Moves copies of the pipes (plus the candidate) with the same
+        # difficulty rules as Simulation.advance_pipes. Returns the frame
+        # nothing survives, or None once the candidate is behind the bird.
+        game, solver = self.game, self.solver
+        config = game.config
+        pipes = []
+        for pipe in game.pipes:
+            projected = sim.Pipe(config, pipe.x, pipe.gap_y, pipe.gap_size)
+            projected.speed = pipe.speed
+            pipes.append(projected)
+        candidate = sim.Pipe(config, config.WINDOW_SIZE[0], gap_y, game.gap_size)
+        pipes.append(candidate)
+
+        # Spawned by reset: frame 1 sets the speeds before moving. Spawned by
+        # a step: this frame's speeds are already set and the new pipe moves
+        # at its base speed.
+        frame = game.frame
+        set_speeds = frame == 0
+        if set_speeds:
+            frame = 1
+        rows = self.rows
+        pipe_width = config.PIPE_WIDTH
+        while True:
+            if set_speeds:
+                difficulty_factor = min(3.0, 1.0 + frame / config.FPS / 30)
+                for pipe in pipes:
+                    pipe.speed = pipe.base_speed * difficulty_factor
+            for pipe in pipes:
+                pipe.update()
+            rows = solver.advance(rows, solver.allowed(pipes))
+            if not rows:
+                return frame
+            if rect_coord(candidate.x) + pipe_width <= solver.bird_x:
+                return None
+            frame += 1
+            set_speeds = True
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Check Giu - Flappy Bird seeds for pipe layouts no flap sequence survives")
+    parser.add_argument('--seed-start', type=int, default=0,
+                        help="first seed to check (default: %(default)s)")
+    parser.add_argument('--seeds', type=int, default=100,
+                        help="number of consecutive seeds to check (default: %(default)s)")
+    parser.add_argument('--frames', type=int, default=60 * 60,
+                        help="frames of each seed to check (default: %(default)s, "
+                             "the minute the difficulty takes to peak)")
+    parser.add_argument('--validate-gaps', action='store_true',
+                        help="check the layouts generated with spawn-time validation on")
+    parser.add_argument('--witness', action='store_true',
+                        help="also find and replay one surviving flap sequence per seed")
+    args = parser.parse_args(argv)
+
+    config = GameConfig(VALIDATE_GAPS=args.validate_gaps)
+    solver = Solver(config)
+    game = Simulation(config, solver=solver) if args.witness else None
+    impossible = 0
+    start = time.perf_counter()
+    for seed in range(args.seed_start, args.seed_start + args.seeds):
+        result = solver.solve(seed, args.frames, args.witness)
+        if not result.survivable:
+            impossible += 1
+            print(f"seed {seed}: impossible, nothing survives frame {result.frames}")
+        elif args.witness:
+            game.reset(seed)
+            flap_frames = set(result.flap_frames)
+            while game.frame < args.frames and game.step(game.frame in flap_frames):
+                pass
+            if game.game_over:
+                print(f"seed {seed}: witness crashed at frame {game.frame}")
+                return 1
+    elapsed = max(time.perf_counter() - start, 1e-9)
+
+    print(f"{impossible}/{args.seeds} seeds impossible within {args.frames} frames, "
+          f"{elapsed / args.seeds * 1000:.1f} ms per seed "
+          f"({args.seeds * args.frames / elapsed:,.0f} frames/s)")
+    return 1 if impossible else 0
+
+if __name__ == "__main__":
+    sys.exit(main())